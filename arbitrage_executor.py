@@ -4,18 +4,154 @@ Arbitrage Executor for Polymarket
 Automatically executes arbitrage opportunities when detected
 """
 
+import os
+import mmap
 import time
+import queue
+import struct
+import threading
+import atexit
+import asyncio
 import logging
-from typing import Dict, Tuple, Optional
-from dataclasses import dataclass, asdict
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
+from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from py_clob_client.client import ClobClient
+from py_clob_client.http_helpers import helpers as clob_http
 from py_clob_client.clob_types import OrderArgs, OrderType
 from py_clob_client.constants import POLYGON
+import config
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 logger = logging.getLogger('arbitrage_executor')
 
-@dataclass
+# HTTP statuses worth one quick retry (rate limit / transient gateway errors)
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+class _RootLoggerHandler(logging.Handler):
+    """Hands queued records to the root logger's handlers"""
+    
+    def emit(self, record):
+        logging.getLogger().handle(record)
+
+# Log through a queue so the order path only enqueues records; formatting
+# and stream/file I/O happen on the listener's background thread
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _RootLoggerHandler())
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+@njit(cache=True, fastmath=True)
+def _calc_stakes_2(price1, price2, bankroll):
+    # Correct formula for equal profit:
+    # We want: stake1/price1 - total_stake = stake2/price2 - total_stake
+    # This simplifies to: stake1/price1 = stake2/price2
+    # And: stake1 + stake2 = bankroll
+    # Solution: stake1 = bankroll * price1 / (price1 + price2)
+    #           stake2 = bankroll * price2 / (price1 + price2)
+    # One division per call; both stakes scale the same ratio
+    scale = bankroll / (price1 + price2)
+    return price1 * scale, price2 * scale
+
+@njit(cache=True, fastmath=True)
+def _calc_stakes_3(price1, price2, price3, bankroll):
+    # For 3-way arbitrage with equal profit:
+    # stake1/price1 = stake2/price2 = stake3/price3
+    # stake1 + stake2 + stake3 = bankroll
+    # Solution: stake_i = bankroll * price_i / (price1 + price2 + price3)
+    scale = bankroll / (price1 + price2 + price3)
+    return price1 * scale, price2 * scale, price3 * scale
+
+@njit(cache=True, fastmath=True)
+def _calc_profit(price1, price2, stake1, stake2):
+    # Payout if either side wins, minus everything staked;
+    # should be approximately equal, return average
+    profit1 = stake1 / price1 - (stake1 + stake2)
+    profit2 = stake2 / price2 - (stake1 + stake2)
+    return (profit1 + profit2) / 2
+
+# Array versions for scoring many opportunities in one call. The explicit
+# signatures make numba compile them eagerly at import, like the warm-up below.
+@njit('UniTuple(float64[:], 2)(float64[:], float64[:], float64)', cache=True, fastmath=True)
+def _calc_stakes_2_vec(prices1, prices2, bankroll):
+    n = prices1.shape[0]
+    stakes1 = np.empty(n)
+    stakes2 = np.empty(n)
+    for i in range(n):
+        stakes1[i] = bankroll * prices1[i] / (prices1[i] + prices2[i])
+        stakes2[i] = bankroll - stakes1[i]
+    return stakes1, stakes2
+
+@njit('UniTuple(float64[:], 3)(float64[:], float64[:], float64[:], float64)', cache=True, fastmath=True)
+def _calc_stakes_3_vec(prices1, prices2, prices3, bankroll):
+    n = prices1.shape[0]
+    stakes1 = np.empty(n)
+    stakes2 = np.empty(n)
+    stakes3 = np.empty(n)
+    for i in range(n):
+        scale = bankroll / (prices1[i] + prices2[i] + prices3[i])
+        stakes1[i] = prices1[i] * scale
+        stakes2[i] = prices2[i] * scale
+        stakes3[i] = prices3[i] * scale
+    return stakes1, stakes2, stakes3
+
+# Compile the kernels at import so the first arbitrage doesn't pay for JIT
+_calc_stakes_2(0.5, 0.5, 1.0)
+_calc_stakes_3(0.3, 0.3, 0.3, 1.0)
+_calc_profit(0.5, 0.5, 0.5, 0.5)
+
+class _PooledRequests:
+    """Stand-in for the requests module that sends through a keep-alive Session
+    with a default timeout"""
+    
+    def __init__(self, session: requests.Session):
+        self._session = session
+    
+    def request(self, method, url, **kwargs):
+        # py_clob_client passes no timeout; never let a CLOB call hang forever
+        kwargs.setdefault('timeout', config.API_TIMEOUT)
+        return self._session.request(method, url, **kwargs)
+    
+    def __getattr__(self, name):
+        # Exceptions and helpers (RequestException, JSONDecodeError, ...) come from requests
+        return getattr(requests, name)
+
+def _install_pooled_session():
+    """Route py_clob_client HTTP calls through one pooled Session
+    
+    py_clob_client calls requests.request() per call, which opens a fresh
+    TCP+TLS connection for every order. Swapping in a Session keeps the
+    connection to the CLOB alive between orders.
+    """
+    if isinstance(getattr(clob_http, 'requests', None), _PooledRequests):
+        return
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=0)
+    )
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    clob_http.requests = _PooledRequests(session)
+
+@dataclass(slots=True, frozen=True)
 class ArbitrageOpportunity:
     """Arbitrage opportunity details"""
     event_title: str
@@ -28,9 +164,9 @@ class ArbitrageOpportunity:
     side2_price: float
     total: float
     profit_percent: float
-    timestamp: float
+    timestamp: int  # time.time_ns()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArbitrageExecution:
     """Arbitrage execution result"""
     opportunity: ArbitrageOpportunity
@@ -41,13 +177,117 @@ class ArbitrageExecution:
     order2_id: Optional[str]
     success: bool
     error: Optional[str]
-    timestamp: float
+    timestamp: int  # time.time_ns()
+
+class ExecutionLog:
+    """Fixed-size ring of execution records in a memory-mapped file
+    
+    Each record is a packed struct, so appending is a single write into
+    pre-allocated pages, and the history survives restarts. A small header
+    holds lifetime totals (records ever written, successes, failures, profit)
+    so stats stay complete after older records are overwritten.
+    """
+    
+    ORDER_ID_BYTES = 66  # CLOB order IDs are 0x + 64 hex chars
+    HEADER = struct.Struct('<QQQd')  # records ever written, successful, failed, total profit
+    RECORD = struct.Struct(f'<qddd{ORDER_ID_BYTES}s{ORDER_ID_BYTES}s?')  # timestamp, stakes, profit, order ids, success
+    DTYPE = np.dtype([
+        ('timestamp', '<i8'),
+        ('stake1', '<f8'),
+        ('stake2', '<f8'),
+        ('profit', '<f8'),
+        ('order1_id', f'S{ORDER_ID_BYTES}'),
+        ('order2_id', f'S{ORDER_ID_BYTES}'),
+        ('success', '?')
+    ])
+    
+    def __init__(self, path: str, capacity: int):
+        self.capacity = capacity
+        size = self.HEADER.size + self.RECORD.size * capacity
+        
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != size:
+                # New file or different capacity/layout - start a fresh ring
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        
+        self._lock = threading.Lock()
+        self.count, self.successful, self.failed, self.total_profit = self.HEADER.unpack_from(self._mm, 0)
+    
+    def _pack_order_id(self, order_id: Optional[str]) -> bytes:
+        """Encode an order ID for its fixed-width field, blanking IDs that would not fit"""
+        encoded = (order_id or '').encode()
+        if len(encoded) > self.ORDER_ID_BYTES:
+            logger.error("❌ Order ID %s longer than %d bytes, not stored in the execution log",
+                         order_id, self.ORDER_ID_BYTES)
+            return b''
+        return encoded
+    
+    def append(self, execution: 'ArbitrageExecution', profit: float):
+        """Write an execution into the next slot of the ring and update the lifetime totals"""
+        order1_id = self._pack_order_id(execution.order1_id)
+        order2_id = self._pack_order_id(execution.order2_id)
+        with self._lock:
+            if self._mm.closed:  # Shutting down
+                return
+            offset = self.HEADER.size + (self.count % self.capacity) * self.RECORD.size
+            self.RECORD.pack_into(
+                self._mm, offset,
+                execution.timestamp,
+                execution.stake1,
+                execution.stake2,
+                profit,
+                order1_id,
+                order2_id,
+                execution.success
+            )
+            self.count += 1
+            if execution.success:
+                self.successful += 1
+                self.total_profit += profit
+            else:
+                self.failed += 1
+            self.HEADER.pack_into(self._mm, 0, self.count, self.successful, self.failed, self.total_profit)
+    
+    def records(self) -> np.ndarray:
+        """Structured array of the retained records (ring order)
+        
+        Copied out of the map: a view held by a caller would keep close() from unmapping.
+        """
+        with self._lock:
+            return np.frombuffer(
+                self._mm,
+                dtype=self.DTYPE,
+                count=min(self.count, self.capacity),
+                offset=self.HEADER.size
+            ).copy()
+    
+    def summary(self) -> Dict:
+        """Lifetime totals from the header (not just the retained records)"""
+        return {
+            'total_executions': self.count,
+            'successful_trades': self.successful,
+            'failed_trades': self.failed,
+            'total_profit': self.total_profit
+        }
+    
+    def close(self):
+        """Flush and unmap the file"""
+        with self._lock:
+            if not self._mm.closed:
+                self._mm.flush()
+                self._mm.close()
 
 class ArbitrageExecutor:
     """Executes arbitrage trades automatically"""
     
     def __init__(self, private_key: str, bankroll: float, min_profit_percent: float = 1.0, 
-                 auto_execute: bool = False, chain_id: int = POLYGON):
+                 auto_execute: bool = False, chain_id: int = POLYGON,
+                 execution_log_path: Optional[str] = None):
         """
         Initialize arbitrage executor
         
@@ -57,30 +297,98 @@ class ArbitrageExecutor:
             min_profit_percent: Minimum profit percentage to execute (default 1%)
             auto_execute: Enable automatic execution (default False for safety)
             chain_id: Blockchain network (POLYGON for mainnet)
+            execution_log_path: File to persist execution records in (None to keep them in memory only)
         """
         self.private_key = private_key
         self.bankroll = bankroll
         self.min_profit_percent = min_profit_percent
         self.auto_execute = auto_execute
         self.chain_id = chain_id
+        self.post_orders = config.ARBITRAGE_POST_ORDERS  # False: sign orders but never submit them
+        
+        # profit_percent >= min_profit_percent  <=>  total <= 1 / (1 + min_profit_percent/100)
+        self._max_total = 1.0 / (1.0 + min_profit_percent / 100.0)
         
-        # Initialize Polymarket CLOB client
+        # Initialize Polymarket CLOB clients - one per arbitrage leg, so the
+        # two legs never share client state while signing/posting concurrently
         try:
-            self.client = ClobClient(
-                host="https://clob.polymarket.com",
-                key=private_key,
-                chain_id=chain_id
-            )
+            self.clients = [
+                ClobClient(
+                    host=config.CFG.clob_api_base,
+                    key=private_key,
+                    chain_id=chain_id
+                )
+                for _ in range(2)
+            ]
+            self.client = self.clients[0]
+            _install_pooled_session()
             logger.info("✅ Polymarket CLOB client initialized")
         except Exception as e:
-            logger.error(f"❌ Failed to initialize CLOB client: {e}")
+            logger.error("❌ Failed to initialize CLOB client: %s", e)
+            self.clients = []
             self.client = None
         
-        # Track executions
-        self.executions = []
+        if self.client and auto_execute:
+            # Warm up DNS, TCP and TLS on the pooled session so the first
+            # order doesn't pay for the handshakes
+            try:
+                self.client.get_server_time()
+            except Exception as e:
+                logger.warning("⚠️ CLOB warm-up request failed: %s", e)
+            
+            # Posting orders needs Level 2 (API key) credentials
+            if self.post_orders:
+                try:
+                    creds = self.client.create_or_derive_api_creds()
+                    for client in self.clients:
+                        client.set_api_creds(creds)
+                except Exception as e:
+                    logger.error("❌ Failed to derive CLOB API credentials: %s", e)
+        
+        # Circuit breaker state for order posting; both leg threads touch it, so it takes _breaker_lock
+        self._breaker_lock = threading.Lock()
+        self._recent_failures = deque()  # monotonic timestamps of failed orders
+        self._cooldown_until = 0.0
+        
+        # Worker threads for placing both legs of an arbitrage concurrently.
+        # Created once and reused; the bound also caps concurrent CLOB calls.
+        self._order_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="arb-exec")
+        atexit.register(self._order_pool.shutdown, wait=False)
+        
+        # Track executions (bounded history, plus a lifetime count for stats).
+        # Executions can run concurrently (execute_arbitrage_async), so updates take _stats_lock.
+        self._stats_lock = threading.Lock()
+        self.executions = deque(maxlen=config.MAX_LOG_ENTRIES)
+        self._total_executions_ever = 0
         self.total_profit = 0.0
         self.successful_trades = 0
         self.failed_trades = 0
+        
+        # Persistent execution history; restore stats from it across restarts
+        self.execution_log = None
+        if execution_log_path:
+            try:
+                self.execution_log = ExecutionLog(execution_log_path, config.MAX_LOG_ENTRIES)
+                atexit.register(self.execution_log.close)
+                history = self.execution_log.summary()
+                self._total_executions_ever = history['total_executions']
+                self.successful_trades = history['successful_trades']
+                self.failed_trades = history['failed_trades']
+                self.total_profit = history['total_profit']
+            except Exception as e:
+                logger.error("❌ Failed to open execution log %s: %s", execution_log_path, e)
+        
+        # Stats dict handed out by get_stats, updated in place
+        self._stats = {
+            'total_executions': 0,
+            'successful_trades': 0,
+            'failed_trades': 0,
+            'total_profit': 0.0,
+            'auto_execute': self.auto_execute,
+            'bankroll': self.bankroll,
+            'min_profit_percent': self.min_profit_percent
+        }
+        self._stats_profit = 0.0  # total_profit value behind the rounded stat
     
     def calculate_stakes(self, price1: float, price2: float, bankroll: float) -> Tuple[float, float]:
         """
@@ -94,18 +402,7 @@ class ArbitrageExecutor:
         Returns:
             (stake1, stake2) - Stakes for each side
         """
-        # Correct formula for equal profit:
-        # We want: stake1/price1 - total_stake = stake2/price2 - total_stake
-        # This simplifies to: stake1/price1 = stake2/price2
-        # And: stake1 + stake2 = bankroll
-        # Solution: stake1 = bankroll * price1 / (price1 + price2)
-        #           stake2 = bankroll * price2 / (price1 + price2)
-        
-        total_price = price1 + price2
-        stake1 = bankroll * price1 / total_price
-        stake2 = bankroll * price2 / total_price
-        
-        return stake1, stake2
+        return _calc_stakes_2(float(price1), float(price2), float(bankroll))
     
     def calculate_stakes_3way(self, price1: float, price2: float, price3: float, 
                               bankroll: float) -> Tuple[float, float, float]:
@@ -121,17 +418,7 @@ class ArbitrageExecutor:
         Returns:
             (stake1, stake2, stake3) - Stakes for each outcome
         """
-        # For 3-way arbitrage with equal profit:
-        # stake1/price1 = stake2/price2 = stake3/price3
-        # stake1 + stake2 + stake3 = bankroll
-        # Solution: stake_i = bankroll * price_i / (price1 + price2 + price3)
-        
-        total_price = price1 + price2 + price3
-        stake1 = bankroll * price1 / total_price
-        stake2 = bankroll * price2 / total_price
-        stake3 = bankroll * price3 / total_price
-        
-        return stake1, stake2, stake3
+        return _calc_stakes_3(float(price1), float(price2), float(price3), float(bankroll))
     
     def calculate_profit(self, price1: float, price2: float, stake1: float, stake2: float) -> float:
         """
@@ -146,16 +433,59 @@ class ArbitrageExecutor:
         Returns:
             Guaranteed profit amount
         """
-        # Payout if side 1 wins
-        payout1 = stake1 / price1
-        profit1 = payout1 - (stake1 + stake2)
+        return _calc_profit(float(price1), float(price2), float(stake1), float(stake2))
+    
+    def calculate_profit_from_total(self, total: float, bankroll: float) -> float:
+        """
+        Calculate guaranteed profit directly from the total price
+        
+        With equal-profit stakes, stake_i/price_i = bankroll/total for every
+        side, so the payout is bankroll/total whichever side wins.
+        
+        Args:
+            total: Sum of the side prices
+            bankroll: Total amount staked
+            
+        Returns:
+            Guaranteed profit amount
+        """
+        return bankroll * (1.0 - total) / total
+    
+    def calculate_stakes_batch(self, prices: np.ndarray, bankroll: float) -> np.ndarray:
+        """
+        Calculate equal-profit stakes for many opportunities at once
         
-        # Payout if side 2 wins
-        payout2 = stake2 / price2
-        profit2 = payout2 - (stake1 + stake2)
+        Args:
+            prices: Array of shape (N, K) - one row per opportunity, one column per outcome
+            bankroll: Total amount to stake per opportunity
+            
+        Returns:
+            Array of shape (N, K) with the stake for each outcome
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim == 2 and len(prices):
+            # 2- and 3-way books go through the compiled kernels
+            if prices.shape[1] == 2:
+                return np.column_stack(_calc_stakes_2_vec(prices[:, 0], prices[:, 1], float(bankroll)))
+            if prices.shape[1] == 3:
+                return np.column_stack(_calc_stakes_3_vec(prices[:, 0], prices[:, 1], prices[:, 2], float(bankroll)))
+        return bankroll * prices / prices.sum(axis=1, keepdims=True)
+    
+    def calculate_profit_batch(self, prices: np.ndarray, stakes: np.ndarray) -> np.ndarray:
+        """
+        Calculate guaranteed profit for many opportunities at once
         
-        # Should be approximately equal, return average
-        return (profit1 + profit2) / 2
+        Args:
+            prices: Array of shape (N, K) of outcome prices
+            stakes: Array of shape (N, K) from calculate_stakes_batch
+            
+        Returns:
+            Array of shape (N,) with the profit for each opportunity
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        stakes = np.asarray(stakes, dtype=np.float64)
+        # Equal-profit stakes pay out the same on every outcome, so outcome 0 is enough
+        return stakes[:, 0] / prices[:, 0] - stakes.sum(axis=1)
     
     def should_execute(self, total: float) -> bool:
         """
@@ -170,16 +500,138 @@ class ArbitrageExecutor:
         if not self.auto_execute:
             return False
         
-        if total >= 1.0:
-            return False
+        if total < 1.0 and total <= self._max_total:
+            return True
         
+        if total < 1.0:
+            self._log_skipped(total)
+        return False
+    
+    def _log_skipped(self, total: float):
+        """Log an opportunity skipped for being below the minimum profit"""
         profit_percent = ((1.0 - total) / total) * 100
+        logger.info("⚠️ Profit %.2f%% below minimum %s%%", profit_percent, self.min_profit_percent)
+    
+    def prime_tokens(self, token_ids: List[str]):
+        """
+        Pre-fetch per-token signing parameters in the background
         
-        if profit_percent < self.min_profit_percent:
-            logger.info(f"⚠️ Profit {profit_percent:.2f}% below minimum {self.min_profit_percent}%")
-            return False
+        create_order looks up each token's tick size and neg-risk flag over
+        HTTP the first time it sees the token. Fetching them ahead of time
+        fills the client's caches, so signing an arbitrage leg is pure CPU.
+        
+        Args:
+            token_ids: Token IDs that may be traded
+        """
+        if not self.client:
+            return
+        
+        def prime():
+            for token_id in token_ids:
+                try:
+                    for client in self.clients:
+                        client.get_tick_size(token_id)
+                        client.get_neg_risk(token_id)
+                except Exception as e:
+                    logger.warning("⚠️ Failed to prefetch order params for %s: %s", token_id, e)
+        
+        threading.Thread(target=prime, daemon=config.DAEMON_THREADS).start()
+    
+    def _prepare_signed_order(self, order_args: OrderArgs, client: Optional[ClobClient] = None):
+        """
+        Sign an order without sending it
+        
+        Signing (EIP-712 hash + secp256k1) is the slow part of order creation,
+        so it is done up front, off the network path.
+        
+        Args:
+            order_args: Order to sign
+            client: CLOB client to sign with (default: the primary client)
+            
+        Returns:
+            Signed order if successful, None otherwise
+        """
+        if not self.client:
+            logger.error("❌ CLOB client not initialized")
+            return None
+        
+        try:
+            return (client or self.client).create_order(order_args)
+        except Exception as e:
+            logger.error("❌ Error signing order: %s", e)
+            return None
+    
+    def _post_signed_order(self, signed_order, client: Optional[ClobClient] = None) -> Optional[str]:
+        """
+        Post a pre-signed order to the CLOB
+        
+        Only submits when post_orders (ARBITRAGE_POST_ORDERS) is on. Fails fast
+        while the circuit breaker is open, and retries once with backoff on
+        rate-limit / transient gateway errors.
+        
+        Args:
+            signed_order: Order from _prepare_signed_order
+            client: CLOB client to post with (default: the primary client)
+            
+        Returns:
+            Order ID if successful, None otherwise
+        """
+        if not self.post_orders:
+            logger.warning("⚠️ Order signed but not posted (ARBITRAGE_POST_ORDERS is off)")
+            return None
+        
+        client = client or self.client
+        with self._breaker_lock:
+            breaker_open = time.monotonic() < self._cooldown_until
+        if breaker_open:
+            logger.warning("⚠️ Order skipped: CLOB circuit breaker open")
+            return None
+        
+        for attempt in range(2):
+            try:
+                # Polymarket's WebSocket endpoints (market/user channels) are
+                # subscription-only, so orders have to go over REST. Latency is
+                # kept down by the pooled keep-alive session instead.
+                response = client.post_order(signed_order, OrderType.GTC)  # Good Till Cancelled
+                
+                if response and 'orderID' in response:
+                    order_id = response['orderID']
+                    logger.info("✅ Order placed: %s", order_id)
+                    return order_id
+                else:
+                    logger.error("❌ Order failed: %s", response)
+                    break
+                    
+            except Exception as e:
+                if attempt == 0 and getattr(e, 'status_code', None) in RETRYABLE_STATUS_CODES:
+                    with self._breaker_lock:
+                        recent = len(self._recent_failures)
+                    time.sleep(min(0.2 * 2 ** recent, 1.0))
+                    continue
+                logger.error("❌ Error placing order: %s", e)
+                break
         
-        return True
+        self._record_order_failure()
+        return None
+    
+    def _record_order_failure(self):
+        """Track a failed order and trip the circuit breaker on repeated failures"""
+        with self._breaker_lock:
+            now = time.monotonic()
+            failures = self._recent_failures
+            failures.append(now)
+            while failures and now - failures[0] > config.ORDER_BREAKER_WINDOW:
+                failures.popleft()
+            
+            tripped = len(failures) >= config.ORDER_BREAKER_MAX_FAILURES
+            if tripped:
+                self._cooldown_until = now + config.ORDER_BREAKER_COOLDOWN
+                failures.clear()
+        
+        if tripped:
+            logger.warning("⚠️ %d failed orders in %.0fs, pausing orders for %.0fs",
+                           config.ORDER_BREAKER_MAX_FAILURES, config.ORDER_BREAKER_WINDOW,
+                           config.ORDER_BREAKER_COOLDOWN)
     
     def place_order(self, token_id: str, side: str, price: float, size: float) -> Optional[str]:
         """
@@ -194,33 +646,19 @@ class ArbitrageExecutor:
         Returns:
             Order ID if successful, None otherwise
         """
-        if not self.client:
-            logger.error("❌ CLOB client not initialized")
+        order_args = OrderArgs(token_id=token_id, price=price, size=size, side=side)
+        signed_order = self._prepare_signed_order(order_args)
+        if signed_order is None:
             return None
-        
+        return self._post_signed_order(signed_order)
+    
+    @staticmethod
+    def _leg_result(future, leg: int) -> Optional[str]:
+        """Order ID from a posting future, or None if the leg raised"""
         try:
-            # Create order arguments
-            order_args = OrderArgs(
-                token_id=token_id,
-                price=price,
-                size=size,
-                side=side,
-                order_type=OrderType.GTC  # Good Till Cancelled
-            )
-            
-            # Place order
-            response = self.client.create_order(order_args)
-            
-            if response and 'orderID' in response:
-                order_id = response['orderID']
-                logger.info(f"✅ Order placed: {order_id} ({side} {size} @ ${price})")
-                return order_id
-            else:
-                logger.error(f"❌ Order failed: {response}")
-                return None
-                
+            return future.result()
         except Exception as e:
-            logger.error(f"❌ Error placing order: {e}")
+            logger.error("❌ Leg %d raised while posting: %s", leg, e)
             return None
     
     def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> ArbitrageExecution:
@@ -233,27 +671,41 @@ class ArbitrageExecutor:
         Returns:
             Execution result
         """
-        logger.info(f"🎯 Executing arbitrage: {opportunity.event_title} ({opportunity.market_type})")
-        logger.info(f"   Total: ${opportunity.total:.4f} | Profit: {opportunity.profit_percent:.2f}%")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🎯 Executing arbitrage: %s (%s)", opportunity.event_title, opportunity.market_type)
+            logger.info("   Total: $%.4f | Profit: %.2f%%", opportunity.total, opportunity.profit_percent)
         
         # Calculate stakes
-        stake1, stake2 = self.calculate_stakes(
-            opportunity.side1_price,
-            opportunity.side2_price,
-            self.bankroll
+        price1 = opportunity.side1_price
+        price2 = opportunity.side2_price
+        stake1, stake2 = self.calculate_stakes(price1, price2, self.bankroll)
+        
+        # Build both orders before anything goes out so the legs stay close together
+        order_args_1 = OrderArgs(
+            token_id=opportunity.side1_token_id,
+            price=price1,
+            size=stake1 / price1,  # Convert to shares
+            side='BUY'
+        )
+        order_args_2 = OrderArgs(
+            token_id=opportunity.side2_token_id,
+            price=price2,
+            size=stake2 / price2,  # Convert to shares
+            side='BUY'
         )
         
-        logger.info(f"   Stake 1 ({opportunity.side1_name}): ${stake1:.2f} @ ${opportunity.side1_price:.4f}")
-        logger.info(f"   Stake 2 ({opportunity.side2_name}): ${stake2:.2f} @ ${opportunity.side2_price:.4f}")
+        # Start signing both orders while the rest of the bookkeeping runs
+        client1, client2 = self.clients or (None, None)
+        sign1 = self._order_pool.submit(self._prepare_signed_order, order_args_1, client1)
+        sign2 = self._order_pool.submit(self._prepare_signed_order, order_args_2, client2)
         
-        # Calculate expected profit
-        profit = self.calculate_profit(
-            opportunity.side1_price,
-            opportunity.side2_price,
-            stake1,
-            stake2
-        )
-        logger.info(f"   Expected profit: ${profit:.2f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   Stake 1 (%s): $%.2f @ $%.4f", opportunity.side1_name, stake1, price1)
+            logger.info("   Stake 2 (%s): $%.2f @ $%.4f", opportunity.side2_name, stake2, price2)
+        
+        # Calculate expected profit (stakes are equal-profit, so the total is enough)
+        profit = self.calculate_profit_from_total(opportunity.total, self.bankroll)
+        logger.info("   Expected profit: $%.2f", profit)
         
         # Execute orders
         order1_id = None
@@ -262,43 +714,37 @@ class ArbitrageExecutor:
         error = None
         
         try:
-            # Place first order
-            order1_id = self.place_order(
-                token_id=opportunity.side1_token_id,
-                side='BUY',
-                price=opportunity.side1_price,
-                size=stake1 / opportunity.side1_price  # Convert to shares
-            )
+            wait((sign1, sign2), return_when=ALL_COMPLETED)
+            signed1 = sign1.result()
+            signed2 = sign2.result()
+            if signed1 is None or signed2 is None:
+                raise Exception("Failed to sign orders")
             
-            if not order1_id:
-                raise Exception("Failed to place order 1")
-            
-            # Place second order
-            order2_id = self.place_order(
-                token_id=opportunity.side2_token_id,
-                side='BUY',
-                price=opportunity.side2_price,
-                size=stake2 / opportunity.side2_price  # Convert to shares
-            )
+            # Post both orders concurrently so the legs hit the book ~1 RTT apart
+            future1 = self._order_pool.submit(self._post_signed_order, signed1, client1)
+            future2 = self._order_pool.submit(self._post_signed_order, signed2, client2)
+            wait((future1, future2), return_when=ALL_COMPLETED)
+            # Collect each leg on its own so one raising never skips cancelling the other
+            order1_id = self._leg_result(future1, 1)
+            order2_id = self._leg_result(future2, 2)
             
-            if not order2_id:
-                # Cancel first order if second fails
-                logger.warning("⚠️ Order 2 failed, attempting to cancel order 1")
-                try:
-                    self.client.cancel_order(order1_id)
-                except:
-                    pass
-                raise Exception("Failed to place order 2")
+            if not order1_id or not order2_id:
+                # Cancel whichever leg went through so we are not left with one side
+                filled_id = order1_id or order2_id
+                if filled_id:
+                    logger.warning("⚠️ One leg failed, attempting to cancel order %s", filled_id)
+                    try:
+                        self.client.cancel(filled_id)
+                    except Exception:
+                        pass
+                raise Exception(f"Failed to place order {1 if not order1_id else 2}")
             
             success = True
-            self.successful_trades += 1
-            self.total_profit += profit
-            logger.info(f"✅ Arbitrage executed successfully!")
+            logger.info("✅ Arbitrage executed successfully!")
             
         except Exception as e:
             error = str(e)
-            self.failed_trades += 1
-            logger.error(f"❌ Arbitrage execution failed: {error}")
+            logger.error("❌ Arbitrage execution failed: %s", error)
         
         # Create execution record
         execution = ArbitrageExecution(
@@ -310,20 +756,47 @@ class ArbitrageExecutor:
             order2_id=order2_id,
             success=success,
             error=error,
-            timestamp=time.time()
+            timestamp=time.time_ns()
         )
         
-        self.executions.append(execution)
+        with self._stats_lock:
+            if success:
+                self.successful_trades += 1
+                self.total_profit += profit
+            else:
+                self.failed_trades += 1
+            self.executions.append(execution)
+            self._total_executions_ever += 1
+            if self.execution_log:
+                self.execution_log.append(execution, profit if success else 0.0)
         return execution
     
+    async def execute_arbitrage_async(self, opportunity: ArbitrageOpportunity) -> ArbitrageExecution:
+        """
+        Execute arbitrage trade from an event loop without blocking it
+        
+        Runs execute_arbitrage on the loop's default executor (not the order
+        pool, which execute_arbitrage itself needs for the two legs).
+        
+        Args:
+            opportunity: Arbitrage opportunity to execute
+            
+        Returns:
+            Execution result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute_arbitrage, opportunity)
+    
     def get_stats(self) -> Dict:
-        """Get execution statistics"""
-        return {
-            'total_executions': len(self.executions),
-            'successful_trades': self.successful_trades,
-            'failed_trades': self.failed_trades,
-            'total_profit': round(self.total_profit, 2),
-            'auto_execute': self.auto_execute,
-            'bankroll': self.bankroll,
-            'min_profit_percent': self.min_profit_percent
-        }
+        """Get execution statistics (shared dict - do not mutate)"""
+        stats = self._stats
+        stats['total_executions'] = self._total_executions_ever
+        stats['successful_trades'] = self.successful_trades
+        stats['failed_trades'] = self.failed_trades
+        
+        # Only re-round when the profit actually moved
+        if self.total_profit != self._stats_profit:
+            stats['total_profit'] = round(self.total_profit, 2)
+            self._stats_profit = self.total_profit
+        
+        return stats
@@ -3,30 +3,56 @@
 Configuration for Polymarket Orderbook Monitor
 """
 
+import sys
+from typing import NamedTuple
+
+class Config(NamedTuple):
+    """API and match discovery settings, fixed for the life of the process"""
+    clob_api_base: str = "https://clob.polymarket.com"
+    data_api_base: str = "https://gamma-api.polymarket.com"
+    api_timeout: int = 10  # seconds
+    default_hours_ahead: int = 48  # hours
+    max_markets_per_request: int = 100
+    sports_tags: frozenset = frozenset(map(sys.intern, (
+        'Sports', 'NBA', 'NFL', 'Soccer', 'Baseball', 'Hockey', 'Tennis', 'MMA', 'Boxing'
+    )))
+    sports_slug_keywords: tuple = ('mlb', 'nfl', 'nba', 'nhl', 'soccer', 'football', 'tennis', 'ufc', 'mma')
+
+CFG = Config()
+
 # API Configuration
-CLOB_API_BASE = "https://clob.polymarket.com"
-DATA_API_BASE = "https://gamma-api.polymarket.com"
-API_TIMEOUT = 10  # seconds
+CLOB_API_BASE = CFG.clob_api_base
+DATA_API_BASE = CFG.data_api_base
+API_TIMEOUT = CFG.api_timeout
 
 # Match Discovery
-DEFAULT_HOURS_AHEAD = 48  # hours
-MAX_MARKETS_PER_REQUEST = 100
-SPORTS_TAGS = ['Sports', 'NBA', 'NFL', 'Soccer', 'Baseball', 'Hockey', 'Tennis', 'MMA', 'Boxing']
+DEFAULT_HOURS_AHEAD = CFG.default_hours_ahead
+MAX_MARKETS_PER_REQUEST = CFG.max_markets_per_request
+SPORTS_TAGS = CFG.sports_tags
+SPORTS_SLUG_KEYWORDS = CFG.sports_slug_keywords  # matched as substrings of event slugs
 
 # Data Storage
 MAX_ORDERBOOK_HISTORY = 1000  # snapshots per market
 MAX_LOG_ENTRIES = 500  # log entries to keep
+MAX_BEST_MATCHES = 1000  # best matches (pairs under $1) to keep
+MAX_TOTAL_RECORDS = 5000  # market total records to keep
+MAX_ATH_LOG = 5000  # new-ATH events kept for /api/ath?since= deltas
 
 # Web Interface
 WEB_HOST = '0.0.0.0'
 WEB_PORT = 5001
 WEB_DEBUG = False
+WEB_THREADS = 32  # gunicorn worker threads; each open WebSocket/SSE client holds one
 
 # Update Intervals (seconds)
 STATUS_UPDATE_INTERVAL = 2
-ORDERBOOK_UPDATE_INTERVAL = 1
+ORDERBOOK_UPDATE_INTERVAL = 1  # REST poll interval
+ENABLE_REST_POLLING = False  # Also poll books over REST alongside the WebSocket
 ATH_UPDATE_INTERVAL = 1
-LOG_STREAM_INTERVAL = 0.5
+MATCHES_CACHE_TTL = 60  # seconds to reuse the upcoming-matches listing
+MATCHES_CACHE_MAX_KEYS = 8  # distinct hours_ahead windows kept in the listing cache
+LOG_STREAM_KEEPALIVE = 15  # seconds between SSE keepalive comments when no logs arrive
+LOG_STREAM_QUEUE_SIZE = 1000  # pending log events per SSE client before dropping
 
 # Logging
 LOG_LEVEL = 'INFO'  # DEBUG, INFO, WARNING, ERROR
@@ -40,9 +66,17 @@ ATH_FLASH_DURATION = 3000  # milliseconds to show "NEW!" badge
 # Performance
 ENABLE_THREADING = True
 DAEMON_THREADS = True
+WS_PUSH_MIN_INTERVAL = 0.05  # seconds between /ws/orderbooks pushes per client; ticks in between are coalesced
 
 # Arbitrage Trading (IMPORTANT: Set these carefully!)
 ARBITRAGE_ENABLED = False  # Set to True to enable auto-trading
 ARBITRAGE_PRIVATE_KEY = ""  # Your Ethereum private key (KEEP SECRET!)
 ARBITRAGE_BANKROLL = 11.0  # Amount in USDC to use per arbitrage (MAX $11)
 ARBITRAGE_MIN_PROFIT_PERCENT = 1.0  # Minimum profit % to execute (1% = 1.0)
+ARBITRAGE_POST_ORDERS = False  # Submit signed orders to the CLOB (REAL MONEY); False = sign only
+ARBITRAGE_EXECUTION_LOG = 'arbitrage_executions.bin'  # Ring buffer of executions, kept across restarts
+
+# Order Circuit Breaker
+ORDER_BREAKER_MAX_FAILURES = 3  # failed orders within the window that trip the breaker
+ORDER_BREAKER_WINDOW = 5.0  # seconds
+ORDER_BREAKER_COOLDOWN = 2.0  # seconds to fast-fail orders once tripped
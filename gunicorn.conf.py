@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration for serving web_app in production
+
+    gunicorn -c gunicorn.conf.py web_app:app
+
+The monitor, executor and their in-memory state live in the web process, so
+there must be exactly one worker. Concurrency comes from threads instead;
+flask-sock WebSockets and the SSE log stream each hold a thread while open.
+"""
+
+from config import WEB_HOST, WEB_PORT, WEB_THREADS  # a module named 'config' would clash with gunicorn's own setting
+
+bind = f"{WEB_HOST}:{WEB_PORT}"
+workers = 1
+worker_class = 'gthread'
+threads = WEB_THREADS
+timeout = 0  # WebSocket/SSE responses are long-lived
+keepalive = 5
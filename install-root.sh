@@ -82,7 +82,7 @@ Type=simple
 User=root
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
-ExecStart=$APP_DIR/venv/bin/python $APP_DIR/web_app.py
+ExecStart=$APP_DIR/venv/bin/gunicorn -c $APP_DIR/gunicorn.conf.py web_app:app
 Restart=always
 RestartSec=10
 StandardOutput=append:$APP_DIR/logs/app.log
@@ -6,18 +6,28 @@ Real-time orderbook tracking with ATH detection
 
 import json
 import time
+import orjson
 import requests
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
-from typing import Dict, List, Optional, Any
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Tuple, Any
 import threading
-from dataclasses import dataclass, asdict
+import queue
+import concurrent.futures
+from dataclasses import dataclass, field, fields
 import logging
+import numpy as np
 import config
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
+import httpx
 import websockets
-from arbitrage_executor import ArbitrageExecutor, ArbitrageOpportunity
+from arbitrage_executor import ArbitrageExecutor, ArbitrageOpportunity, njit  # njit: numba's, or a no-op without numba
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Setup logging
 logging.basicConfig(
@@ -26,8 +36,23 @@ logging.basicConfig(
     datefmt=config.LOG_DATE_FORMAT
 )
 logger = logging.getLogger('orderbook_monitor')
+logging.getLogger('httpx').setLevel(logging.WARNING)  # httpx logs every request at INFO
+
+def with_to_dict(cls):
+    """Class decorator adding to_dict(), generated once from the dataclass fields
+    
+    The method builds the dict with a literal, avoiding asdict()'s per-call
+    field reflection and recursive copying. Values are returned as-is, so
+    only use it on records whose fields are all scalars.
+    """
+    items = ", ".join(f"{f.name!r}: self.{f.name}" for f in fields(cls))
+    namespace = {}
+    exec(f"def to_dict(self):\n    return {{{items}}}", namespace)
+    cls.to_dict = namespace['to_dict']
+    return cls
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class OrderbookSnapshot:
     """Orderbook snapshot data"""
     timestamp: float
@@ -40,7 +65,8 @@ class OrderbookSnapshot:
     spread: float
     mid_price: float
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class ATHRecord:
     """All-Time High record"""
     market_id: str
@@ -50,7 +76,8 @@ class ATHRecord:
     timestamp: float
     side: str  # 'bid' or 'ask'
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class ATLRecord:
     """All-Time Low record"""
     market_id: str
@@ -60,7 +87,8 @@ class ATLRecord:
     timestamp: float
     side: str  # 'bid' or 'ask'
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class BestMatch:
     """Best match when both sides total under $1"""
     event_id: str
@@ -73,7 +101,8 @@ class BestMatch:
     total: float
     timestamp: float
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class TotalRecord:
     """Historical record of market totals"""
     event_id: str
@@ -87,7 +116,7 @@ class TotalRecord:
     timestamp: float
     is_best: bool  # True if under $1
 
-@dataclass
+@dataclass(slots=True)
 class SportMatch:
     """Sports match information"""
     event_id: str
@@ -97,26 +126,179 @@ class SportMatch:
     end_time: str
     markets: List[Dict[str, Any]]
     active: bool = False
+    parsed_markets: List[tuple] = field(default_factory=list)  # (token_id, market_name), filled on subscribe
+
+@njit(cache=True)
+def _scan_pairs(side_asks, side_counts, last_totals, flags):
+    """Flag pair/triplet groups whose total moved by more than $0.001
+    
+    side_asks holds each group's best asks (NaN until a side has a book).
+    flags[i] is set to 1 if the new total is under $1, 2 if it is not, and
+    0 if it is unchanged. Returns the number of flagged groups.
+    """
+    changed = 0
+    for i in range(side_counts.size):
+        flags[i] = 0
+        n = side_counts[i]
+        if n != 2 and n != 3:
+            continue
+        total = 0.0
+        for j in range(n):
+            total += side_asks[i, j]
+        if total != total:  # a side has no book yet
+            continue
+        last = last_totals[i]
+        if last != last or abs(last - total) > 0.001:
+            last_totals[i] = total
+            flags[i] = 1 if total < 1.0 else 2
+            changed += 1
+    return changed
+
+# Compile the kernel at import so the first reconciliation doesn't pay for JIT
+_scan_pairs(np.full((1, 3), np.nan), np.zeros(1, dtype=np.int64), np.full(1, np.nan), np.zeros(1, dtype=np.int8))
+
+def _level_prices(levels: List[Dict]) -> np.ndarray:
+    """Parse the prices of book levels into a float64 array (sizes are left alone)"""
+    return np.fromiter((float(level['price']) for level in levels), dtype=np.float64, count=len(levels))
+
+class LatencyWindow:
+    """Fixed-size window of latency samples (integer nanoseconds) with a running sum
+    
+    Appending and reading the mean are O(1), so the hot path never iterates
+    the window just to log an average. Integer samples keep the sum exact.
+    """
+    
+    def __init__(self, size: int = 100):
+        self.size = size
+        self.buf = np.zeros(size, dtype=np.int64)
+        self.idx = 0
+        self.count = 0  # samples ever appended
+        self._sum = 0
+    
+    def append(self, value_ns: int):
+        """Add a sample, evicting the oldest once the window is full"""
+        buf = self.buf
+        idx = self.idx
+        self._sum += value_ns - buf.item(idx)  # item() skips the numpy scalar
+        buf[idx] = value_ns
+        idx += 1
+        self.idx = 0 if idx == self.size else idx
+        self.count += 1
+    
+    @property
+    def mean(self) -> float:
+        """Average of the samples in the window in ns (0 when empty)"""
+        n = len(self)
+        return self._sum / n if n else 0.0
+    
+    @property
+    def mean_ms(self) -> float:
+        """Average of the samples in the window in ms"""
+        return self.mean / 1e6
+    
+    def stats_ms(self) -> tuple:
+        """(mean, min, max) of the window in ms via numpy reductions"""
+        window = self.buf[:len(self)]
+        return self.mean_ms, window.min() / 1e6, window.max() / 1e6
+    
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+    
+    def __iter__(self):
+        return iter(self.buf[:len(self)].tolist())
+
+# Packed top-of-book record: timestamp, best bid/ask, bid/ask size, spread, mid price
+BOOK_DTYPE = np.dtype([
+    ('ts', 'f8'),
+    ('bb', 'f8'),
+    ('ba', 'f8'),
+    ('bs', 'f8'),
+    ('as', 'f8'),
+    ('sp', 'f8'),
+    ('mp', 'f8')
+])
+
+class RingBook:
+    """Per-asset top-of-book history as a ring of packed BOOK_DTYPE records
+    
+    Pushing writes one 56-byte record into a preallocated array, so recording
+    a tick allocates nothing; columns (e.g. buf['ba']) slice contiguously.
+    """
+    
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.buf = np.zeros(maxlen, dtype=BOOK_DTYPE)
+        self.head = 0  # next slot to write
+        self.count = 0  # ticks ever pushed
+    
+    def push(self, ts: float, bid: float, ask: float, bsize: float, asize: float):
+        """Record one tick, overwriting the oldest once full"""
+        head = self.head
+        self.buf[head] = (ts, bid, ask, bsize, asize, ask - bid, (bid + ask) / 2)
+        head += 1
+        self.head = 0 if head == self.maxlen else head
+        self.count += 1
+    
+    def __len__(self) -> int:
+        return min(self.count, self.maxlen)
 
 class OrderbookMonitor:
     """Monitor Polymarket orderbooks via WebSocket"""
     
+    UNKNOWN_ASSET = {'name': 'Unknown', 'log_prefix': '📊 Unknown: ', 'event_name': None, 'market_type': None, 'outcome': None}
+    
     def __init__(self, arbitrage_executor: Optional[ArbitrageExecutor] = None):
         self.api_base = config.CLOB_API_BASE
         self.data_api = config.DATA_API_BASE
         self.ws_url = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
         
         self.subscribed_markets: Dict[str, SportMatch] = {}
-        self.orderbook_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=config.MAX_ORDERBOOK_HISTORY))
+        self.orderbook_data: Dict[str, RingBook] = {}  # token_id -> history, created on subscribe
         self.ath_records: Dict[str, ATHRecord] = {}
         self.atl_records: Dict[str, ATLRecord] = {}
+        
+        # Running extremes per asset (row = asset_idx); records are only built on a new extreme
+        self.asset_idx: Dict[str, int] = {}
+        self.ath_bid = np.full(0, -np.inf)
+        self.ath_ask = np.full(0, -np.inf)
+        self.atl_bid = np.full(0, np.inf)
+        self.atl_ask = np.full(0, np.inf)
+        
+        # Current top of book per asset (same rows) for column scans like /api/asks
+        self.asset_ids: List[str] = []  # asset_idx -> token_id
+        self.asset_teams: List[Optional[str]] = []  # asset_idx -> team/outcome shown in /api/asks
+        self.cur_ask = np.full(0, np.nan)
+        self.cur_ask_size = np.zeros(0)
+        self.is_moneyline = np.zeros(0, dtype=np.bool_)
         self.current_snapshots: Dict[str, OrderbookSnapshot] = {}
         self.token_to_market: Dict[str, str] = {}  # Map token_id to market_name
         self.market_to_token: Dict[str, str] = {}  # Map market_name to token_id
+        self.asset_meta: Dict[str, Dict[str, str]] = {}  # token_id -> {name, log_prefix, event_name, market_type, outcome}
+        self.asks_descending: Dict[str, bool] = {}  # token_id -> asks verified sorted high to low
+        self.pair_index: Dict[str, tuple] = {}  # token_id -> (event_name, market_type, group, slot, position)
+        self.pair_groups: Dict[str, List[tuple]] = {}  # pair_key -> [(token_id, outcome), ...]
+        
+        # Best asks per group as arrays (row = slot) for the batched pair scan
+        self.pair_keys: List[str] = []  # slot -> pair_key
+        self.pair_slot: Dict[str, int] = {}  # pair_key -> slot
+        self.pair_asks = np.full((0, 3), np.nan)
+        self.pair_counts = np.zeros(0, dtype=np.int64)
+        self.pair_last_totals = np.full(0, np.nan)
+        self.pair_flags = np.zeros(0, dtype=np.int8)
+        
+        # Per-asset tick handlers, specialised on subscribe (see add_book_handler)
+        self.book_handlers: Dict[str, Any] = {}
         
         # Best match tracking (pairs under $1)
-        self.best_matches: List[BestMatch] = []
-        self.total_records: List[TotalRecord] = []
+        self.best_matches: deque = deque(maxlen=config.MAX_BEST_MATCHES)
+        self.total_records: deque = deque(maxlen=config.MAX_TOTAL_RECORDS)
+        
+        # Plain-dict views served by the getters, so API reads skip to_dict()
+        self.best_match_dicts: deque = deque(maxlen=config.MAX_BEST_MATCHES)
+        self.total_record_dicts: deque = deque(maxlen=config.MAX_TOTAL_RECORDS)
+        self._snapshot_dicts: Dict[str, tuple] = {}  # token_id -> (snapshot, dict)
+        self._ath_dicts: Dict[str, tuple] = {}  # key -> (record, dict)
+        self._atl_dicts: Dict[str, tuple] = {}
         self.last_totals: Dict[str, float] = {}  # Track last total for each market pair
         
         # ATL Total tracking (lowest sum of all markets in an event)
@@ -125,24 +307,36 @@ class OrderbookMonitor:
         
         # Arbitrage executor (optional)
         self.arbitrage_executor = arbitrage_executor
+        self.arbitrage_in_flight: Dict[str, asyncio.Task] = {}  # Pair key -> task placing its orders
         
         self.running = False
         self.ws_connection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # loop running the monitor
+        self._stop: Optional[asyncio.Event] = None  # set by stop() to end the receive loop
+        self._resubscribe: Optional[asyncio.Event] = None  # set by resubscribe() to reconnect with new tokens
+        self.stopped = threading.Event()  # set while no run() is active; wait on it before starting again
+        self.stopped.set()
         self.logs = deque(maxlen=config.MAX_LOG_ENTRIES)
+        self._matches_cache: Dict[int, tuple] = {}  # hours_ahead -> (monotonic fetch time, matches)
+        self._matches_by_id: Dict[str, tuple] = {}  # event_id -> (monotonic fetch time, match)
+        self._matches_lock = threading.Lock()  # Flask request threads share the caches
+        self.subscription_seq = 0  # bumped whenever a match's active flag changes
+        self._log_subscribers: List[queue.Queue] = []  # SSE clients; replaced, never mutated in place
+        self._log_subscribers_lock = threading.Lock()
+        
+        # Update sequence numbers; readers block on update_cond/ath_cond instead of polling
+        self.update_cond = threading.Condition()
+        self.ath_cond = threading.Condition()
+        self.update_seq = 0  # bumped on every orderbook update
+        self.total_updates = 0  # book updates recorded into history, for get_status()
+        self.ath_seq = 0  # bumped on every new ATH record
+        self.ath_log: deque = deque(maxlen=config.MAX_ATH_LOG)  # (ath_seq, record dict) per new ATH
+        self._orderbooks_payload: Optional[tuple] = None  # (update_seq, serialized /ws/orderbooks message)
+        self._payload_lock = threading.Lock()
         
         # Performance tracking
         self.last_update_time = 0
-        self.update_latencies = deque(maxlen=100)  # Track last 100 update times
-        
-        # HTTP session for connection pooling
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=20,
-            pool_maxsize=20,
-            max_retries=0
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        self.update_latencies = LatencyWindow(100)  # Track last 100 update times
         
     def log(self, message: str, level: str = "INFO"):
         """Add log entry"""
@@ -151,19 +345,71 @@ class OrderbookMonitor:
             'level': level,
             'message': message
         }
-        self.logs.append(log_entry)
+        # Append and read the subscribers together so subscribe_logs() sees each
+        # entry either in its backlog or on its queue, never both
+        with self._log_subscribers_lock:
+            self.logs.append(log_entry)
+            subscribers = self._log_subscribers
+        if subscribers:
+            event = b"data: " + orjson.dumps(log_entry) + b"\n\n"
+            for q in subscribers:
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    pass  # Slow client; drop rather than block the monitor
         
-        if level == "INFO":
+        if level == "DEBUG":
+            logger.debug(message)
+        elif level == "INFO":
             logger.info(message)
         elif level == "WARNING":
             logger.warning(message)
         elif level == "ERROR":
             logger.error(message)
     
-    def get_upcoming_sports_matches(self, hours_ahead: int = None) -> List[SportMatch]:
-        """Fetch upcoming sports matches"""
+    def subscribe_logs(self, backlog: int = 0) -> Tuple[List[Dict], queue.Queue]:
+        """Register a queue that receives every new log entry as an SSE event
+        
+        Args:
+            backlog: Number of recent entries to return alongside the queue
+            
+        Returns:
+            (recent entries, bounded queue of pre-serialized ``data: ...`` byte
+            strings) - taken together, so no entry is in both or neither
+        """
+        q = queue.Queue(maxsize=config.LOG_STREAM_QUEUE_SIZE)
+        with self._log_subscribers_lock:
+            recent = self.deque_tail(self.logs, backlog)
+            self._log_subscribers = self._log_subscribers + [q]
+        return recent, q
+    
+    def unsubscribe_logs(self, q: queue.Queue):
+        """Stop delivering log entries to a queue from subscribe_logs()"""
+        with self._log_subscribers_lock:
+            self._log_subscribers = [s for s in self._log_subscribers if s is not q]
+    
+    def get_upcoming_sports_matches(self, hours_ahead: int = None, refresh: bool = False) -> List[SportMatch]:
+        """Fetch upcoming sports matches
+        
+        Results are cached per ``hours_ahead`` (at most MATCHES_CACHE_MAX_KEYS
+        windows) for MATCHES_CACHE_TTL seconds and indexed by event id for
+        find_match().
+        
+        Args:
+            hours_ahead: Only include games starting within this many hours
+            refresh: Skip the cache and fetch from the API
+        
+        Returns:
+            List of upcoming SportMatch objects
+        """
         if hours_ahead is None:
             hours_ahead = config.DEFAULT_HOURS_AHEAD
+        
+        if not refresh:
+            with self._matches_lock:
+                cached = self._matches_cache.get(hours_ahead)
+            if cached and time.monotonic() - cached[0] < config.MATCHES_CACHE_TTL:
+                return cached[1]
             
         try:
             self.log(f"🔍 Fetching sports matches starting within {hours_ahead} hours...")
@@ -185,7 +431,7 @@ class OrderbookMonitor:
             for event in events:
                 # Filter for sports events (check slug for sports keywords)
                 slug = event.get('slug', '').lower()
-                if not any(sport in slug for sport in ['mlb', 'nfl', 'nba', 'nhl', 'soccer', 'football', 'tennis', 'ufc', 'mma']):
+                if not any(sport in slug for sport in config.SPORTS_SLUG_KEYWORDS):
                     continue
                 
                 # Check if starting soon (use creationDate as game time)
@@ -210,12 +456,45 @@ class OrderbookMonitor:
                     continue
             
             self.log(f"✅ Found {len(sports_matches)} upcoming sports matches")
+            self.cache_matches(hours_ahead, sports_matches)
             return sports_matches
             
         except Exception as e:
             self.log(f"❌ Error fetching matches: {str(e)}", "ERROR")
             return []
     
+    def cache_matches(self, hours_ahead: int, matches: List[SportMatch]):
+        """Store a fresh match list, dropping expired entries and capping the window count"""
+        now = time.monotonic()
+        cutoff = now - config.MATCHES_CACHE_TTL
+        with self._matches_lock:
+            cache = {h: entry for h, entry in self._matches_cache.items() if entry[0] > cutoff and h != hours_ahead}
+            while len(cache) >= config.MATCHES_CACHE_MAX_KEYS:
+                del cache[min(cache, key=lambda h: cache[h][0])]  # Oldest window goes first
+            cache[hours_ahead] = (now, matches)
+            self._matches_cache = cache
+            
+            by_id = {event_id: entry for event_id, entry in self._matches_by_id.items() if entry[0] > cutoff}
+            for match in matches:
+                by_id[match.event_id] = (now, match)
+            self._matches_by_id = by_id
+    
+    def find_match(self, event_id: str, hours_ahead: int = 48) -> Optional[SportMatch]:
+        """Look up a listed match by event id, refetching on a miss or a stale entry
+        
+        Args:
+            event_id: Polymarket event id
+            hours_ahead: Window to fetch if the match is not cached
+        
+        Returns:
+            The SportMatch, or None if the API does not list it
+        """
+        hit = self._matches_by_id.get(event_id)
+        if hit is None or time.monotonic() - hit[0] >= config.MATCHES_CACHE_TTL:
+            self.get_upcoming_sports_matches(hours_ahead=hours_ahead, refresh=True)
+            hit = self._matches_by_id.get(event_id)
+        return hit[1] if hit else None
+    
     def subscribe_by_slug(self, event_slug: str) -> bool:
         """Subscribe to an event by its slug"""
         try:
@@ -249,31 +528,134 @@ class OrderbookMonitor:
             self.log(f"❌ Error subscribing to {event_slug}: {str(e)}", "ERROR")
             return False
     
+    def call_on_loop(self, func, *args):
+        """Run func on the monitor's loop thread and return its result
+        
+        Subscription changes grow the per-asset and pair arrays that book
+        handlers write on every tick; running them on the loop thread means
+        no tick can land in an array that is being copied. Calls func directly
+        when the loop is not running or this already is the loop thread.
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return func(*args)
+        try:
+            if asyncio.get_running_loop() is loop:
+                return func(*args)
+        except RuntimeError:
+            pass  # Not inside any loop
+        
+        future = concurrent.futures.Future()
+        claim = threading.Lock()  # Whoever takes it runs func, so it runs exactly once
+        
+        def run():
+            if claim.acquire(blocking=False):
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        
+        try:
+            loop.call_soon_threadsafe(run)
+        except RuntimeError:
+            return func(*args)  # Loop closed meanwhile
+        while True:
+            try:
+                return future.result(timeout=0.5)
+            except concurrent.futures.TimeoutError:
+                # The loop may have exited before getting to the callback
+                if not loop.is_running() and claim.acquire(blocking=False):
+                    return func(*args)
+    
     def subscribe_to_match(self, match: SportMatch):
-        """Subscribe to a match's orderbook"""
+        """Subscribe to a match's orderbook (on the monitor loop while it runs)"""
+        self.call_on_loop(self.add_match, match)
+    
+    def unsubscribe_from_match(self, event_id: str):
+        """Unsubscribe from a match (on the monitor loop while it runs)"""
+        self.call_on_loop(self.remove_match, event_id)
+    
+    def add_match(self, match: SportMatch):
+        """Register a match, its tokens and their per-asset state; use subscribe_to_match()"""
         self.subscribed_markets[match.event_id] = match
         match.active = True
+        self.subscription_seq += 1
         
-        # Calculate expected number of markets (excluding "No" outcomes)
+        # Parse token IDs and outcomes once; the hot loops reuse the result.
+        # Expected number of markets excludes "No" outcomes.
         expected_markets = 0
+        parsed_markets = []
         for market in match.markets:
+            token_ids_str = market.get('clobTokenIds', '[]')
             outcomes_str = market.get('outcomes', '[]')
             try:
+                token_ids = json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
                 outcomes = json.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
-                # Count non-"No" outcomes
-                expected_markets += sum(1 for outcome in outcomes if outcome != "No")
             except:
                 continue
+            
+            # Count non-"No" outcomes
+            expected_markets += sum(1 for outcome in outcomes if outcome != "No")
+            
+            question = market.get('question', 'Unknown')
+            for idx, token_id in enumerate(token_ids):
+                if not token_id:
+                    continue
+                outcome_name = outcomes[idx] if idx < len(outcomes) else f"Option {idx+1}"
+                
+                # Skip "No" outcomes - we only want the positive outcomes
+                if outcome_name == "No":
+                    continue
+                
+                # Parse question to get better names for 3-way markets
+                # e.g., "Will Nottingham Forest win?" -> "Nottingham Forest"
+                if outcome_name == "Yes" and "Will" in question:
+                    if "win" in question.lower():
+                        # Extract team name from "Will X win on..."
+                        outcome_name = question.split("Will ")[-1].split(" win")[0]
+                    elif "draw" in question.lower():
+                        outcome_name = "Draw"
+                
+                market_name = f"{question} - {outcome_name}"
+                parsed_markets.append((token_id, market_name))
+                event_name, market_type, outcome = self.classify_market(market_name) or (None, None, None)
+                self.asset_meta[token_id] = {
+                    'name': market_name,
+                    'log_prefix': f"📊 {market_name}: ",
+                    'event_name': event_name,
+                    'market_type': market_type,
+                    'outcome': outcome
+                }
+                
+                # Per-asset state is created here so the hot paths never have to
+                if token_id not in self.orderbook_data:
+                    self.orderbook_data[token_id] = RingBook(config.MAX_ORDERBOOK_HISTORY)
+                if token_id not in self.asset_idx:
+                    self.add_asset(token_id)
         
+        match.parsed_markets = parsed_markets
+        self.index_pairs(parsed_markets)
+        for token_id, market_name in parsed_markets:
+            # Map token IDs to market names (bidirectional)
+            self.token_to_market[token_id] = market_name
+            self.market_to_token[market_name] = token_id
+            self.add_book_handler(token_id, market_name)
         self.expected_markets_count[match.slug] = expected_markets
         self.log(f"✅ Subscribed to: {match.title} (expecting {expected_markets} markets)")
     
-    def unsubscribe_from_match(self, event_id: str):
-        """Unsubscribe from a match"""
+    def remove_match(self, event_id: str):
+        """Drop a match and its tokens; use unsubscribe_from_match()"""
         if event_id in self.subscribed_markets:
             match = self.subscribed_markets[event_id]
             match.active = False
             del self.subscribed_markets[event_id]
+            self.subscription_seq += 1  # After the change, so a reader holding the new seq sees it
+            
+            # Drop its tokens so reconnects and polls stop requesting them
+            for token_id, market_name in match.parsed_markets:
+                self.token_to_market.pop(token_id, None)
+                if self.market_to_token.get(market_name) == token_id:
+                    del self.market_to_token[market_name]
             self.log(f"❌ Unsubscribed from: {match.title}")
     
     async def connect_websocket(self):
@@ -283,6 +665,7 @@ class OrderbookMonitor:
         reconnect_delay = 5
         
         while self.running:
+            resubscribing = False
             try:
                 self.log("🔌 Connecting to Polymarket WebSocket...")
                 
@@ -290,55 +673,28 @@ class OrderbookMonitor:
                 # - Shorter ping interval for faster connection monitoring
                 # - Disable compression for faster processing
                 # - Set max message size to handle large orderbooks
+                # - Larger read buffer so bursts don't pause the socket; the frame
+                #   queue keeps the library default so buffered frames stay bounded
                 async with websockets.connect(
                     self.ws_url, 
                     ping_interval=10,  # Faster ping for quicker reconnection detection
                     ping_timeout=5,    # Shorter timeout
-                    max_size=10_000_000,  # 10MB max message size
+                    max_size=10_000_000,  # 10MB max message size (initial book dump)
+                    read_limit=2**20,  # 1MB stream buffer
                     compression=None   # Disable compression for speed
                 ) as websocket:
                     self.ws_connection = websocket
                     self.log("✅ WebSocket connected!")
                     
-                    # Collect all token IDs
-                    all_token_ids = []
-                    for event_id, match in self.subscribed_markets.items():
-                        for market in match.markets:
-                            token_ids_str = market.get('clobTokenIds', '[]')
-                            outcomes_str = market.get('outcomes', '[]')
-                            try:
-                                token_ids = json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
-                                outcomes = json.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
-                            except:
-                                token_ids = []
-                                outcomes = []
-                            
-                            # Map token IDs to market names (bidirectional)
-                            # Only subscribe to "Yes" outcomes, skip "No" outcomes
-                            for idx, token_id in enumerate(token_ids):
-                                if token_id:
-                                    outcome_name = outcomes[idx] if idx < len(outcomes) else f"Option {idx+1}"
-                                    
-                                    # Skip "No" outcomes - we only want the positive outcomes
-                                    if outcome_name == "No":
-                                        continue
-                                    
-                                    question = market.get('question', 'Unknown')
-                                    
-                                    # Parse question to get better names for 3-way markets
-                                    # e.g., "Will Nottingham Forest win?" -> "Nottingham Forest"
-                                    if outcome_name == "Yes" and "Will" in question:
-                                        if "win" in question.lower():
-                                            # Extract team name from "Will X win on..."
-                                            team = question.split("Will ")[-1].split(" win")[0]
-                                            outcome_name = team
-                                        elif "draw" in question.lower():
-                                            outcome_name = "Draw"
-                                    
-                                    market_name = f"{question} - {outcome_name}"
-                                    self.token_to_market[token_id] = market_name
-                                    self.market_to_token[market_name] = token_id
-                                    all_token_ids.append(token_id)
+                    # This connection already subscribes to the latest tokens
+                    self._resubscribe.clear()
+                    
+                    # Token maps are maintained by subscribe/unsubscribe
+                    all_token_ids = list(self.token_to_market)
+                    
+                    # Warm the executor's per-token order parameters before any arbitrage fires
+                    if self.arbitrage_executor:
+                        self.arbitrage_executor.prime_tokens(all_token_ids)
                     
                     # Subscribe with correct format: assets_ids and type
                     subscribe_msg = {
@@ -346,36 +702,59 @@ class OrderbookMonitor:
                         "type": "market"
                     }
                     
-                    await websocket.send(json.dumps(subscribe_msg))
+                    await websocket.send(orjson.dumps(subscribe_msg).decode())  # text frame
                     self.log(f"📡 Subscribed to {len(all_token_ids)} markets via WebSocket")
                     
-                    # Listen for messages with optimized processing
-                    while self.running:
-                        try:
-                            # Receive message with minimal timeout for faster processing
-                            message = await asyncio.wait_for(websocket.recv(), timeout=0.5)
-                            
-                            # Parse JSON immediately (no delay)
-                            data = json.loads(message)
-                            
-                            # Process message with high priority
-                            await self.process_websocket_message(data)
-                        except asyncio.TimeoutError:
-                            # No message received, continue immediately
-                            continue
-                        except websockets.exceptions.ConnectionClosed as e:
-                            self.log(f"⚠️ WebSocket connection closed: {str(e)}", "WARNING")
-                            break
-                        except Exception as e:
-                            self.log(f"❌ Error processing message: {str(e)}", "ERROR")
+                    # stop() closes the socket, which wakes the pending recv()
+                    stop_watcher = asyncio.create_task(self.close_on_stop(websocket))
+                    
+                    # Listen for messages; iteration ends when the socket closes cleanly
+                    try:
+                        async for message in websocket:
+                            try:
+                                data = orjson.loads(message)
+                                await self.process_websocket_message(data)
+                            except Exception as e:
+                                self.log(f"❌ Error processing message: {str(e)}", "ERROR")
+                            if not self.running:
+                                break
+                    except websockets.exceptions.ConnectionClosed as e:
+                        closed_reason = str(e)
+                    else:
+                        closed_reason = "closed by server"
+                    
+                    if self._resubscribe.is_set():
+                        resubscribing = True
+                    elif self.running:
+                        self.log(f"⚠️ WebSocket connection closed: {closed_reason}", "WARNING")
+                    
+                    stop_watcher.cancel()
                             
             except Exception as e:
                 self.log(f"❌ WebSocket error: {str(e)}", "ERROR")
             
+            # Subscriptions changed: reconnect straight away
+            if resubscribing and self.running:
+                self.log("🔄 Resubscribing with updated markets...")
+                continue
+            
             # Reconnect if still running
             if self.running:
                 self.log(f"🔄 Reconnecting in {reconnect_delay} seconds...")
-                await asyncio.sleep(reconnect_delay)
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+    
+    async def close_on_stop(self, websocket):
+        """Close the WebSocket once stop() or resubscribe() is requested so a pending recv() returns"""
+        waiters = [asyncio.ensure_future(self._stop.wait()), asyncio.ensure_future(self._resubscribe.wait())]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        await websocket.close()
     
     async def process_websocket_message(self, data):
         """Process WebSocket message"""
@@ -385,6 +764,7 @@ class OrderbookMonitor:
                 self.log(f"📦 Received initial orderbooks: {len(data)} markets")
                 for book in data:
                     await self.process_book_message(book)
+                self.check_best_matches()
                 return
             
             # Handle price_change messages
@@ -408,81 +788,62 @@ class OrderbookMonitor:
         try:
             # Capture timestamp IMMEDIATELY for maximum precision
             snapshot_timestamp = time.time()
-            process_start = snapshot_timestamp
+            process_start = time.monotonic_ns()
             
             # Full orderbook snapshot
             asset_id = data.get('asset_id')
             if not asset_id:
                 return
             
-            market_name = self.token_to_market.get(asset_id, 'Unknown')
+            meta = self.asset_meta.get(asset_id) or self.UNKNOWN_ASSET
+            market_name = meta['name']
             
             # Parse orderbook with optimized operations
             bids = data.get('bids', [])
             asks = data.get('asks', [])
             
             if bids and asks:
-                # Optimized: Find lowest ask with direct float conversion
-                min_ask = min(asks, key=lambda x: float(x['price']))
-                best_ask = float(min_ask['price'])
-                ask_size = float(min_ask['size'])
+                # Lowest ask is the last level (asks are sorted high to low)
+                best_ask, ask_size = self.best_ask_level(asset_id, asks)
                 
-                # Optimized: Highest bid (already sorted)
-                best_bid = float(bids[0]['price']) if bids else 0
-                bid_size = float(bids[0]['size']) if bids else 0
+                # Highest bid (already sorted); only the top level is parsed
+                top_bid = bids[0]
+                best_bid = float(top_bid['price'])
+                bid_size = float(top_bid['size'])
                 
-                # Quick calculations
-                spread = best_ask - best_bid
-                mid_price = (best_bid + best_ask) / 2
+                # Store snapshot, history, pair ask and ATH/ATL in one specialised call
+                handler = self.book_handlers.get(asset_id) or self.add_book_handler(asset_id, market_name)
+                handler(snapshot_timestamp, best_bid, bid_size, best_ask, ask_size)
                 
-                # Create snapshot with precise timestamp
-                snapshot = OrderbookSnapshot(
-                    timestamp=snapshot_timestamp,  # Use captured timestamp
-                    market_id=asset_id,
-                    market_name=market_name,
-                    best_bid=best_bid,
-                    best_ask=best_ask,
-                    bid_size=bid_size,
-                    ask_size=ask_size,
-                    spread=spread,
-                    mid_price=mid_price
-                )
-                
-                # Store snapshot immediately
-                self.current_snapshots[asset_id] = snapshot
-                self.orderbook_data[asset_id].append(snapshot)
-                
-                # CRITICAL: Check ATL totals FIRST (most time-sensitive)
+                # CRITICAL: Check ATL totals (most time-sensitive)
                 # This ensures we calculate the total at the exact moment all markets are present
                 self.check_atl_totals()
                 
-                # Then check individual ATH/ATL (less time-sensitive)
-                self.check_ath(asset_id, market_name, best_bid, bid_size, 'bid')
-                self.check_ath(asset_id, market_name, best_ask, ask_size, 'ask')
-                self.check_atl(asset_id, market_name, best_bid, bid_size, 'bid')
-                self.check_atl(asset_id, market_name, best_ask, ask_size, 'ask')
+                # Check this asset's pair for a best match (under $1)
+                self.check_pair(asset_id)
                 
-                # Check for best matches (pairs under $1)
-                self.check_best_matches()
+                # Wake anything pushing orderbooks to clients
+                self.notify_update()
                 
                 # Track latency
-                process_time = (time.time() - process_start) * 1000
-                self.update_latencies.append(process_time)
+                process_ns = time.monotonic_ns() - process_start
+                self.update_latencies.append(process_ns)
                 
-                # Log every update for real-time visibility
-                avg_latency = sum(self.update_latencies) / len(self.update_latencies) if self.update_latencies else 0
-                self.log(f"📊 {market_name}: Ask ${best_ask:.2f} | Bid ${best_bid:.2f} | Latency: {process_time:.2f}ms | Avg: {avg_latency:.2f}ms")
+                # Per-update log only when debugging; formatting it costs more than the tick
+                if logger.isEnabledFor(logging.DEBUG):
+                    avg_latency = self.update_latencies.mean_ms
+                    self.log(f"{meta['log_prefix']}Ask ${best_ask:.2f} | Bid ${best_bid:.2f} | Latency: {process_ns / 1e6:.2f}ms | Avg: {avg_latency:.2f}ms", "DEBUG")
                 
         except Exception as e:
             self.log(f"❌ Error processing book message: {str(e)}", "ERROR")
     
-    def fetch_single_orderbook(self, token_id: str, market_name: str) -> tuple:
-        """Fetch a single orderbook (for parallel execution)"""
+    async def fetch_single_orderbook(self, client: httpx.AsyncClient, token_id: str, market_name: str) -> tuple:
+        """Fetch a single orderbook (run concurrently by poll_orderbooks)"""
         try:
-            request_start = time.time()
+            request_start = time.monotonic_ns()
             url = f"{self.api_base}/book"
-            response = self.session.get(url, params={'token_id': token_id}, timeout=config.API_TIMEOUT)
-            request_time = (time.time() - request_start) * 1000
+            response = await client.get(url, params={'token_id': token_id})
+            request_time = time.monotonic_ns() - request_start
             
             if response.status_code == 200:
                 return (token_id, market_name, response.json(), request_time, None)
@@ -491,67 +852,52 @@ class OrderbookMonitor:
         except Exception as e:
             return (token_id, market_name, None, 0, str(e))
     
-    def poll_orderbooks(self):
-        """Poll orderbooks via REST API with parallel requests"""
+    async def poll_orderbooks(self):
+        """Poll orderbooks via REST API with concurrent requests on the event loop"""
         try:
-            self.log("🔄 Starting orderbook polling (parallel mode)...")
+            self.log("🔄 Starting orderbook polling (async mode)...")
             
-            # Create a thread pool for parallel requests
-            executor = ThreadPoolExecutor(max_workers=10)
-            
-            while self.running:
-                poll_start = time.time()
-                
-                # Collect all tasks to execute in parallel
-                tasks = []
-                for event_id, match in self.subscribed_markets.items():
-                    for market in match.markets:
-                        # Parse clobTokenIds and outcomes
-                        token_ids_str = market.get('clobTokenIds', '[]')
-                        outcomes_str = market.get('outcomes', '[]')
-                        try:
-                            token_ids = json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
-                            outcomes = json.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
-                        except:
-                            token_ids = []
-                            outcomes = []
-                        
-                        # Submit all orderbook fetches in parallel
-                        for idx, token_id in enumerate(token_ids):
-                            if token_id:
-                                outcome_name = outcomes[idx] if idx < len(outcomes) else f"Option {idx+1}"
-                                market_name = f"{market.get('question', 'Unknown')} - {outcome_name}"
-                                future = executor.submit(self.fetch_single_orderbook, token_id, market_name)
-                                tasks.append(future)
-                
-                # Wait for all requests to complete
-                for future in as_completed(tasks):
-                    token_id, market_name, data, request_time, error = future.result()
+            # One long-lived client; HTTP/2 multiplexes the fetches over a few connections
+            limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+            async with httpx.AsyncClient(http2=True, limits=limits, timeout=config.API_TIMEOUT) as client:
+                while self.running:
+                    poll_start = time.monotonic_ns()
                     
-                    if error:
-                        self.log(f"⚠️ Error fetching {token_id[:20]}...: {error}", "WARNING")
-                    elif data:
-                        self.process_orderbook_data(token_id, market_name, data, request_time)
-                
-                # Calculate total poll cycle time
-                poll_time = (time.time() - poll_start) * 1000  # Convert to ms
-                self.update_latencies.append(poll_time)
-                
-                # Log performance every 10 cycles
-                if len(self.update_latencies) % 10 == 0:
-                    avg_latency = sum(self.update_latencies) / len(self.update_latencies)
-                    self.log(f"⚡ Avg poll cycle: {avg_latency:.0f}ms | Last: {poll_time:.0f}ms")
-                
-                # Sleep between polls
-                time.sleep(1)
-            
-            executor.shutdown(wait=True)
+                    # Collect all fetches to run concurrently
+                    fetches = []
+                    for token_id, market_name in list(self.token_to_market.items()):
+                        fetches.append(self.fetch_single_orderbook(client, token_id, market_name))
+                    
+                    # Only the network waits overlap; each book is processed on this
+                    # loop as soon as it lands, one at a time, so shared state has a
+                    # single writer
+                    for fetch in asyncio.as_completed(fetches):
+                        token_id, market_name, data, request_time, error = await fetch
+                        if error:
+                            self.log(f"⚠️ Error fetching {token_id[:20]}...: {error}", "WARNING")
+                        elif data:
+                            self.process_orderbook_data(token_id, market_name, data, request_time)
+                    
+                    # Check for best matches across the freshly polled books
+                    self.check_best_matches()
+                    
+                    # Calculate total poll cycle time
+                    poll_ns = time.monotonic_ns() - poll_start
+                    self.update_latencies.append(poll_ns)
+                    
+                    # Log performance every 10 cycles
+                    if self.update_latencies.count % 10 == 0:
+                        avg_latency = self.update_latencies.mean_ms
+                        self.log(f"⚡ Avg poll cycle: {avg_latency:.0f}ms | Last: {poll_ns // 1_000_000}ms")
+                    
+                    # Sleep between polls
+                    await asyncio.sleep(config.ORDERBOOK_UPDATE_INTERVAL)
                         
         except Exception as e:
             self.log(f"❌ Polling error: {str(e)}", "ERROR")
     
-    def process_orderbook_data(self, token_id: str, market_name: str, data: Dict, request_time: float = 0):
-        """Process orderbook data from REST API"""
+    def process_orderbook_data(self, token_id: str, market_name: str, data: Dict, request_time: int = 0):
+        """Process orderbook data from REST API (request_time in ns)"""
         try:
             # Parse orderbook
             bids = data.get('bids', [])
@@ -565,50 +911,153 @@ class OrderbookMonitor:
             bid_size = float(bids[0]['size']) if bids else 0
             
             # Asks are sorted high to low, but we want LOWEST ask (best price to buy)
-            # Find the minimum ask price
-            min_ask = min(asks, key=lambda x: float(x['price']))
-            best_ask = float(min_ask['price'])
-            ask_size = float(min_ask['size'])
-            
-            spread = best_ask - best_bid
-            mid_price = (best_bid + best_ask) / 2
+            best_ask, ask_size = self.best_ask_level(token_id, asks)
             
-            # Create snapshot
-            snapshot = OrderbookSnapshot(
-                timestamp=time.time(),
-                market_id=token_id,
-                market_name=market_name,
-                best_bid=best_bid,
-                best_ask=best_ask,
-                bid_size=bid_size,
-                ask_size=ask_size,
-                spread=spread,
-                mid_price=mid_price
-            )
-            
-            # Store snapshot
-            self.current_snapshots[token_id] = snapshot
-            self.orderbook_data[token_id].append(snapshot)
-            
-            # Check for ATH and ATL
-            self.check_ath(token_id, market_name, best_bid, bid_size, 'bid')
-            self.check_ath(token_id, market_name, best_ask, ask_size, 'ask')
-            self.check_atl(token_id, market_name, best_bid, bid_size, 'bid')
-            self.check_atl(token_id, market_name, best_ask, ask_size, 'ask')
+            # Store snapshot, history, pair ask and check ATH/ATL
+            handler = self.book_handlers.get(token_id) or self.add_book_handler(token_id, market_name)
+            history = handler(time.time(), best_bid, bid_size, best_ask, ask_size)
+            self.notify_update()
             
             # Log update (less verbose)
-            if len(self.orderbook_data[token_id]) % 10 == 0:  # Log every 10th update
-                self.log(f"📊 {market_name}: Bid ${best_bid:.4f} ({bid_size:.1f}) | Ask ${best_ask:.4f} ({ask_size:.1f}) | Spread ${spread:.4f}")
+            if history.count % 10 == 0:  # Log every 10th update
+                self.log(f"📊 {market_name}: Bid ${best_bid:.4f} ({bid_size:.1f}) | Ask ${best_ask:.4f} ({ask_size:.1f}) | Spread ${best_ask - best_bid:.4f}")
             
         except Exception as e:
             self.log(f"❌ Error processing orderbook: {str(e)}", "ERROR")
     
+    def best_ask_level(self, token_id: str, asks: List[Dict]) -> tuple:
+        """Get (price, size) of the lowest ask
+        
+        Asks arrive sorted high to low, so the best level is the last one.
+        The ordering is verified once per token; if it does not hold, that
+        token falls back to a full scan.
+        """
+        descending = self.asks_descending.get(token_id)
+        if descending is None:
+            prices = _level_prices(asks)
+            descending = bool(np.all(prices[1:] <= prices[:-1]))
+            self.asks_descending[token_id] = descending
+            if not descending:
+                self.log(f"⚠️ Asks for {token_id[:20]}... are not sorted high to low, using full scan", "WARNING")
+        
+        if descending:
+            level = asks[-1]
+            return float(level['price']), float(level['size'])
+        
+        # Unsorted book: parse prices once, then take the min with a C-level key
+        _f = float
+        prices = [_f(level['price']) for level in asks]
+        k = min(range(len(prices)), key=prices.__getitem__)
+        return prices[k], _f(asks[k]['size'])
+    
+    def add_book_handler(self, asset_id: str, market_name: str):
+        """Build and register the per-asset update for a book tick
+        
+        Everything fixed for the asset (name, history ring, extreme row, pair
+        slot) is resolved once here, so a tick only does the numeric work:
+        store the snapshot, push history, write the pair ask and compare the
+        ATH/ATL extremes. The arrays are read through self because they are
+        reallocated when they grow.
+        """
+        i = self.asset_idx.get(asset_id)
+        if i is None:
+            i = self.add_asset(asset_id)
+        history = self.orderbook_data.get(asset_id)
+        if history is None:
+            history = self.add_history(asset_id)
+        pair = self.pair_index.get(asset_id)
+        pair_slot, pair_pos = (pair[3], pair[4]) if pair and pair[4] < 3 else (None, None)
+        self.is_moneyline[i] = 'O/U' not in market_name and 'Spread' not in market_name
+        # Team name from "Question - Team" format
+        parts = market_name.split(' - ')
+        self.asset_teams[i] = parts[-1] if len(parts) > 1 else market_name
+        snapshots = self.current_snapshots
+        push = history.push
+        
+        def handle(ts: float, best_bid: float, bid_size: float, best_ask: float, ask_size: float) -> RingBook:
+            snapshots[asset_id] = OrderbookSnapshot(
+                ts, asset_id, market_name, best_bid, best_ask, bid_size, ask_size,
+                best_ask - best_bid, (best_bid + best_ask) / 2
+            )
+            push(ts, best_bid, best_ask, bid_size, ask_size)
+            self.total_updates += 1
+            self.cur_ask[i] = best_ask
+            self.cur_ask_size[i] = ask_size
+            if pair_slot is not None:
+                self.pair_asks[pair_slot, pair_pos] = best_ask
+            
+            if best_bid > self.ath_bid[i]:
+                self.ath_bid[i] = best_bid
+                self.check_ath(asset_id, market_name, best_bid, bid_size, 'bid')
+            if best_ask > self.ath_ask[i]:
+                self.ath_ask[i] = best_ask
+                self.check_ath(asset_id, market_name, best_ask, ask_size, 'ask')
+            if best_bid < self.atl_bid[i]:
+                self.atl_bid[i] = best_bid
+                self.check_atl(asset_id, market_name, best_bid, bid_size, 'bid')
+            if best_ask < self.atl_ask[i]:
+                self.atl_ask[i] = best_ask
+                self.check_atl(asset_id, market_name, best_ask, ask_size, 'ask')
+            return history
+        
+        self.book_handlers[asset_id] = handle
+        return handle
+    
+    def add_history(self, asset_id: str) -> RingBook:
+        """Create the history ring for an asset that was not seen at subscribe time"""
+        history = self.orderbook_data[asset_id] = RingBook(config.MAX_ORDERBOOK_HISTORY)
+        return history
+    
+    def add_asset(self, asset_id: str) -> int:
+        """Assign an asset its row in the per-asset arrays, growing them as needed
+        
+        Growth rebinds the arrays, so this runs on the monitor loop thread
+        (see call_on_loop) like every writer of them.
+        """
+        i = len(self.asset_idx)
+        if i == len(self.ath_bid):
+            grow = max(64, i)
+            self.ath_bid = np.concatenate((self.ath_bid, np.full(grow, -np.inf)))
+            self.ath_ask = np.concatenate((self.ath_ask, np.full(grow, -np.inf)))
+            self.atl_bid = np.concatenate((self.atl_bid, np.full(grow, np.inf)))
+            self.atl_ask = np.concatenate((self.atl_ask, np.full(grow, np.inf)))
+            self.cur_ask = np.concatenate((self.cur_ask, np.full(grow, np.nan)))
+            self.cur_ask_size = np.concatenate((self.cur_ask_size, np.zeros(grow)))
+            self.is_moneyline = np.concatenate((self.is_moneyline, np.zeros(grow, dtype=np.bool_)))
+        self.asset_ids.append(asset_id)
+        self.asset_teams.append(None)
+        self.asset_idx[asset_id] = i
+        return i
+    
+    def notify_update(self):
+        """Bump the update sequence and wake waiters"""
+        with self.update_cond:
+            self.update_seq += 1
+            self.update_cond.notify_all()
+    
+    def wait_for_update(self, last_seq: int, timeout: float = 5.0, ath: bool = False) -> int:
+        """Block until the orderbook (or ATH) sequence moves past last_seq
+        
+        Args:
+            last_seq: Sequence number the caller has already seen
+            timeout: Seconds to wait before returning anyway
+            ath: Wait on the ATH sequence instead of the orderbook one
+            
+        Returns:
+            The current sequence number
+        """
+        name = 'ath_seq' if ath else 'update_seq'
+        cond = self.ath_cond if ath else self.update_cond
+        with cond:
+            cond.wait_for(lambda: getattr(self, name) != last_seq, timeout)
+            return getattr(self, name)
+    
     def check_ath(self, market_id: str, market_name: str, price: float, size: float, side: str):
         """Check and update ATH records"""
         key = f"{market_id}_{side}"
         
         if key not in self.ath_records or price > self.ath_records[key].price:
-            self.ath_records[key] = ATHRecord(
+            record = ATHRecord(
                 market_id=market_id,
                 market_name=market_name,
                 price=price,
@@ -616,6 +1065,15 @@ class OrderbookMonitor:
                 timestamp=time.time(),
                 side=side
             )
+            # Record, log and seq bump move together under ath_cond, so a reader's
+            # (seq, records) snapshot never holds a record its seq does not cover.
+            # Separate condition so ATH waiters are not woken by every book tick.
+            with self.ath_cond:
+                self.ath_records[key] = record
+                self.ath_seq += 1
+                self.ath_log.append((self.ath_seq, record.to_dict()))
+                self.ath_cond.notify_all()
+            self.notify_update()
             self.log(f"🚀 NEW ATH! {market_name} {side.upper()}: ${price:.4f} (size: {size:.1f})", "WARNING")
     
     def check_atl(self, market_id: str, market_name: str, price: float, size: float, side: str):
@@ -672,11 +1130,13 @@ class OrderbookMonitor:
                     # Calculate total of all asks with maximum precision
                     total = sum(snap.best_ask for snap in event_snapshots)
                     
-                    # Determine market type (moneyline, spread, etc.)
+                    # Determine market type (moneyline, spread, etc.) from the subscribe-time classification
+                    asset_meta = self.asset_meta
+                    types = {asset_meta[snap.market_id]['market_type'] for snap in event_snapshots if snap.market_id in asset_meta}
                     market_type = 'Moneyline'
-                    if any('Spread' in snap.market_name for snap in event_snapshots):
+                    if 'Spread' in types:
                         market_type = 'Spread'
-                    elif any('O/U' in snap.market_name or 'Over/Under' in snap.market_name for snap in event_snapshots):
+                    elif 'O/U' in types:
                         market_type = 'O/U'
                     
                     # Check if this is a new ATL total
@@ -705,162 +1165,233 @@ class OrderbookMonitor:
         except Exception as e:
             self.log(f"❌ Error checking ATL totals: {str(e)}", "ERROR")
     
+    @staticmethod
+    def classify_market(market_name: str) -> Optional[tuple]:
+        """Split a market name into (event_name, market_type, outcome)
+        
+        Markets sharing an event_name and market_type form one pair (2-way)
+        or triplet (3-way). Returns None for names without an outcome.
+        """
+        # Parse market name to extract event and type
+        parts = market_name.split(' - ')
+        if len(parts) < 2:
+            return None
+        
+        event_name = parts[0]
+        outcome = parts[1]
+        
+        # Determine market type
+        market_type = 'Moneyline'
+        if 'Spread' in event_name:
+            market_type = 'Spread'
+        elif 'O/U' in event_name or 'Over/Under' in event_name:
+            market_type = 'O/U'
+        
+        # Special handling for 3-way markets (Win/Draw/Win)
+        # Look for "Will X win" and "Will X vs Y end in a draw"
+        if 'Will' in event_name and ('win' in event_name.lower() or 'draw' in event_name.lower()):
+            # Extract base event name (e.g., "Nottingham Forest vs. Chelsea")
+            if 'vs.' in event_name or 'vs' in event_name:
+                # Extract the "X vs Y" part
+                if ' vs. ' in event_name:
+                    base_event = event_name.split('Will ')[-1].split(' vs. ')[0] + ' vs. ' + \
+                                event_name.split(' vs. ')[1].split(' win')[0].split(' end')[0]
+                else:
+                    base_event = event_name.split('Will ')[-1].split(' win')[0].split(' end')[0]
+                event_name = base_event
+                market_type = '3-Way Moneyline'
+        
+        return event_name, market_type, outcome
+    
+    def index_pairs(self, parsed_markets: List[tuple]):
+        """Map each token to the pair/triplet it belongs to
+        
+        Every member of a group shares one [(token_id, outcome), ...] list, so
+        a book update only has to look at its own group. Uses the
+        classification stored in asset_meta at subscribe time.
+        """
+        for token_id, market_name in parsed_markets:
+            if token_id in self.pair_index:
+                continue
+            meta = self.asset_meta[token_id]
+            event_name, market_type, outcome = meta['event_name'], meta['market_type'], meta['outcome']
+            if event_name is None:
+                continue
+            pair_key = f"{event_name}_{market_type}"
+            group = self.pair_groups.get(pair_key)
+            if group is None:
+                group = self.pair_groups[pair_key] = []
+                self.pair_slot[pair_key] = len(self.pair_keys)
+                self.pair_keys.append(pair_key)
+            group.append((token_id, outcome))
+            self.pair_index[token_id] = (event_name, market_type, group, self.pair_slot[pair_key], len(group) - 1)
+        
+        # Grow the group arrays to cover any new slots
+        added = len(self.pair_keys) - len(self.pair_counts)
+        if added:
+            self.pair_asks = np.vstack((self.pair_asks, np.full((added, 3), np.nan)))
+            self.pair_counts = np.concatenate((self.pair_counts, np.zeros(added, dtype=np.int64)))
+            self.pair_last_totals = np.concatenate((self.pair_last_totals, np.full(added, np.nan)))
+            self.pair_flags = np.zeros(len(self.pair_keys), dtype=np.int8)
+        for slot, pair_key in enumerate(self.pair_keys):
+            self.pair_counts[slot] = len(self.pair_groups[pair_key])
+    
+    def check_pair(self, asset_id: str):
+        """Check the pair/triplet containing asset_id once all its sides have books"""
+        try:
+            entry = self.pair_index.get(asset_id)
+            if entry is None:
+                return
+            
+            event_name, market_type, group = entry[:3]
+            snapshots = self.current_snapshots
+            outcomes = []
+            for token_id, outcome in group:
+                snapshot = snapshots.get(token_id)
+                if snapshot is None:
+                    return
+                outcomes.append({'snapshot': snapshot, 'outcome': outcome})
+            
+            self.evaluate_group(event_name, market_type, outcomes)
+        
+        except Exception as e:
+            self.log(f"❌ Error checking best matches: {str(e)}", "ERROR")
+    
     def check_best_matches(self):
-        """Check for best matches where sides total under $1 (2-way or 3-way)"""
+        """Check every pair/triplet where sides total under $1 (2-way or 3-way)
+        
+        Batched pass over all groups: a compiled scan of the group arrays finds
+        the totals that moved, and only those groups are evaluated. Book updates
+        use check_pair instead; this reconciles after a batch of books.
+        """
         try:
-            # Group snapshots by event and market type
-            event_markets = defaultdict(lambda: defaultdict(list))
+            if not self.pair_keys:
+                return
+            if not _scan_pairs(self.pair_asks, self.pair_counts, self.pair_last_totals, self.pair_flags):
+                return
             
-            for snapshot in self.current_snapshots.values():
-                # Parse market name to extract event and type
-                parts = snapshot.market_name.split(' - ')
-                if len(parts) < 2:
-                    continue
-                
-                event_name = parts[0]
-                outcome = parts[1]
-                
-                # Determine market type
-                market_type = 'Moneyline'
-                if 'Spread' in event_name:
-                    market_type = 'Spread'
-                elif 'O/U' in event_name or 'Over/Under' in event_name:
-                    market_type = 'O/U'
-                
-                # Special handling for 3-way markets (Win/Draw/Win)
-                # Look for "Will X win" and "Will X vs Y end in a draw"
-                if 'Will' in event_name and ('win' in event_name.lower() or 'draw' in event_name.lower()):
-                    # Extract base event name (e.g., "Nottingham Forest vs. Chelsea")
-                    if 'vs.' in event_name or 'vs' in event_name:
-                        # Extract the "X vs Y" part
-                        if ' vs. ' in event_name:
-                            base_event = event_name.split('Will ')[-1].split(' vs. ')[0] + ' vs. ' + \
-                                        event_name.split(' vs. ')[1].split(' win')[0].split(' end')[0]
-                        else:
-                            base_event = event_name.split('Will ')[-1].split(' win')[0].split(' end')[0]
-                        event_name = base_event
-                        market_type = '3-Way Moneyline'
-                
-                event_markets[event_name][market_type].append({
-                    'snapshot': snapshot,
-                    'outcome': outcome
-                })
-            
-            # Check each event's market types for pairs or triplets
-            for event_name, market_types in event_markets.items():
-                for market_type, outcomes in market_types.items():
-                    # Handle 2-way markets
-                    if len(outcomes) == 2:
-                        # We have a pair
-                        side1 = outcomes[0]
-                        side2 = outcomes[1]
-                        
-                        total = side1['snapshot'].best_ask + side2['snapshot'].best_ask
-                        
-                        # Create unique key for this market pair
-                        pair_key = f"{event_name}_{market_type}"
-                        
-                        # Check if total changed
-                        if pair_key not in self.last_totals or abs(self.last_totals[pair_key] - total) > 0.001:
-                            # Record this total
-                            record = TotalRecord(
-                                event_id=pair_key,
-                                event_title=event_name,
-                                market_type=market_type,
-                                side1_name=side1['outcome'],
-                                side1_price=side1['snapshot'].best_ask,
-                                side2_name=side2['outcome'],
-                                side2_price=side2['snapshot'].best_ask,
-                                total=total,
-                                timestamp=time.time(),
-                                is_best=(total < 1.0)
-                            )
-                            self.total_records.append(record)
-                            self.last_totals[pair_key] = total
-                            
-                            # If under $1, it's a best match
-                            if total < 1.0:
-                                best_match = BestMatch(
-                                    event_id=pair_key,
-                                    event_title=event_name,
-                                    market_type=market_type,
-                                    side1_name=side1['outcome'],
-                                    side1_price=side1['snapshot'].best_ask,
-                                    side2_name=side2['outcome'],
-                                    side2_price=side2['snapshot'].best_ask,
-                                    total=total,
-                                    timestamp=time.time()
-                                )
-                                self.best_matches.append(best_match)
-                                self.log(f"🎯 BEST MATCH! {event_name} {market_type}: ${total:.2f} ({side1['outcome']}: ${side1['snapshot'].best_ask:.2f} + {side2['outcome']}: ${side2['snapshot'].best_ask:.2f})", "WARNING")
-                                
-                                # Auto-execute arbitrage if enabled
-                                if self.arbitrage_executor and self.arbitrage_executor.should_execute(total):
-                                    self.execute_arbitrage(
-                                        event_name=event_name,
-                                        market_type=market_type,
-                                        side1_name=side1['outcome'],
-                                        side1_price=side1['snapshot'].best_ask,
-                                        side1_market_name=side1['snapshot'].market_name,
-                                        side2_name=side2['outcome'],
-                                        side2_price=side2['snapshot'].best_ask,
-                                        side2_market_name=side2['snapshot'].market_name,
-                                        total=total
-                                    )
-                    
-                    # Handle 3-way markets (Team1, Draw, Team2)
-                    elif len(outcomes) == 3:
-                        # Calculate total of all 3 sides
-                        total = sum(o['snapshot'].best_ask for o in outcomes)
-                        
-                        # Create unique key for this market triplet
-                        pair_key = f"{event_name}_{market_type}"
-                        
-                        # Check if total changed
-                        if pair_key not in self.last_totals or abs(self.last_totals[pair_key] - total) > 0.001:
-                            # Record this total
-                            record = TotalRecord(
-                                event_id=pair_key,
-                                event_title=event_name,
-                                market_type=market_type,
-                                side1_name=f"{outcomes[0]['outcome']}/{outcomes[1]['outcome']}/{outcomes[2]['outcome']}",
-                                side1_price=outcomes[0]['snapshot'].best_ask,
-                                side2_name="3-way",
-                                side2_price=outcomes[1]['snapshot'].best_ask + outcomes[2]['snapshot'].best_ask,
-                                total=total,
-                                timestamp=time.time(),
-                                is_best=(total < 1.0)
-                            )
-                            self.total_records.append(record)
-                            self.last_totals[pair_key] = total
-                            
-                            # If under $1, it's a best match
-                            if total < 1.0:
-                                # Log all 3 sides
-                                sides_str = " + ".join([f"{o['outcome']}: ${o['snapshot'].best_ask:.2f}" for o in outcomes])
-                                self.log(f"🎯 3-WAY BEST MATCH! {event_name}: ${total:.2f} ({sides_str})", "WARNING")
-                                
-                                # Create best match record
-                                best_match = BestMatch(
-                                    event_id=pair_key,
-                                    event_title=event_name,
-                                    market_type=market_type,
-                                    side1_name=outcomes[0]['outcome'],
-                                    side1_price=outcomes[0]['snapshot'].best_ask,
-                                    side2_name=f"{outcomes[1]['outcome']}/{outcomes[2]['outcome']}",
-                                    side2_price=outcomes[1]['snapshot'].best_ask + outcomes[2]['snapshot'].best_ask,
-                                    total=total,
-                                    timestamp=time.time()
-                                )
-                                self.best_matches.append(best_match)
-                                
-                                # Note: 3-way arbitrage execution would need different logic
-                                # For now, just log the opportunity
-                                self.log(f"💡 3-way arbitrage detected but auto-execution not yet supported", "INFO")
+            for slot in np.flatnonzero(self.pair_flags):
+                group = self.pair_groups[self.pair_keys[slot]]
+                self.check_pair(group[0][0])
         
         except Exception as e:
             self.log(f"❌ Error checking best matches: {str(e)}", "ERROR")
     
+    def evaluate_group(self, event_name: str, market_type: str, outcomes: List[Dict]):
+        """Record the total of a pair/triplet and act on it if it is under $1"""
+        # Handle 2-way markets
+        if len(outcomes) == 2:
+            # We have a pair
+            side1 = outcomes[0]
+            side2 = outcomes[1]
+            
+            total = side1['snapshot'].best_ask + side2['snapshot'].best_ask
+            
+            # Create unique key for this market pair
+            pair_key = f"{event_name}_{market_type}"
+            
+            # Check if total changed
+            if pair_key not in self.last_totals or abs(self.last_totals[pair_key] - total) > 0.001:
+                # Record this total
+                record = TotalRecord(
+                    event_id=pair_key,
+                    event_title=event_name,
+                    market_type=market_type,
+                    side1_name=side1['outcome'],
+                    side1_price=side1['snapshot'].best_ask,
+                    side2_name=side2['outcome'],
+                    side2_price=side2['snapshot'].best_ask,
+                    total=total,
+                    timestamp=time.time(),
+                    is_best=(total < 1.0)
+                )
+                self.total_records.append(record)
+                self.total_record_dicts.append(record.to_dict())
+                self.last_totals[pair_key] = total
+                
+                # If under $1, it's a best match
+                if total < 1.0:
+                    best_match = BestMatch(
+                        event_id=pair_key,
+                        event_title=event_name,
+                        market_type=market_type,
+                        side1_name=side1['outcome'],
+                        side1_price=side1['snapshot'].best_ask,
+                        side2_name=side2['outcome'],
+                        side2_price=side2['snapshot'].best_ask,
+                        total=total,
+                        timestamp=time.time()
+                    )
+                    self.best_matches.append(best_match)
+                    self.best_match_dicts.append(best_match.to_dict())
+                    self.log(f"🎯 BEST MATCH! {event_name} {market_type}: ${total:.2f} ({side1['outcome']}: ${side1['snapshot'].best_ask:.2f} + {side2['outcome']}: ${side2['snapshot'].best_ask:.2f})", "WARNING")
+                    
+                    # Auto-execute arbitrage if enabled
+                    if self.arbitrage_executor and self.arbitrage_executor.should_execute(total):
+                        self.execute_arbitrage(
+                            event_name=event_name,
+                            market_type=market_type,
+                            side1_name=side1['outcome'],
+                            side1_price=side1['snapshot'].best_ask,
+                            side1_market_name=side1['snapshot'].market_name,
+                            side2_name=side2['outcome'],
+                            side2_price=side2['snapshot'].best_ask,
+                            side2_market_name=side2['snapshot'].market_name,
+                            total=total
+                        )
+        
+        # Handle 3-way markets (Team1, Draw, Team2)
+        elif len(outcomes) == 3:
+            # Calculate total of all 3 sides
+            total = sum(o['snapshot'].best_ask for o in outcomes)
+            
+            # Create unique key for this market triplet
+            pair_key = f"{event_name}_{market_type}"
+            
+            # Check if total changed
+            if pair_key not in self.last_totals or abs(self.last_totals[pair_key] - total) > 0.001:
+                # Record this total
+                record = TotalRecord(
+                    event_id=pair_key,
+                    event_title=event_name,
+                    market_type=market_type,
+                    side1_name=f"{outcomes[0]['outcome']}/{outcomes[1]['outcome']}/{outcomes[2]['outcome']}",
+                    side1_price=outcomes[0]['snapshot'].best_ask,
+                    side2_name="3-way",
+                    side2_price=outcomes[1]['snapshot'].best_ask + outcomes[2]['snapshot'].best_ask,
+                    total=total,
+                    timestamp=time.time(),
+                    is_best=(total < 1.0)
+                )
+                self.total_records.append(record)
+                self.total_record_dicts.append(record.to_dict())
+                self.last_totals[pair_key] = total
+                
+                # If under $1, it's a best match
+                if total < 1.0:
+                    # Log all 3 sides
+                    sides_str = " + ".join([f"{o['outcome']}: ${o['snapshot'].best_ask:.2f}" for o in outcomes])
+                    self.log(f"🎯 3-WAY BEST MATCH! {event_name}: ${total:.2f} ({sides_str})", "WARNING")
+                    
+                    # Create best match record
+                    best_match = BestMatch(
+                        event_id=pair_key,
+                        event_title=event_name,
+                        market_type=market_type,
+                        side1_name=outcomes[0]['outcome'],
+                        side1_price=outcomes[0]['snapshot'].best_ask,
+                        side2_name=f"{outcomes[1]['outcome']}/{outcomes[2]['outcome']}",
+                        side2_price=outcomes[1]['snapshot'].best_ask + outcomes[2]['snapshot'].best_ask,
+                        total=total,
+                        timestamp=time.time()
+                    )
+                    self.best_matches.append(best_match)
+                    self.best_match_dicts.append(best_match.to_dict())
+                    
+                    # Note: 3-way arbitrage execution would need different logic
+                    # For now, just log the opportunity
+                    self.log(f"💡 3-way arbitrage detected but auto-execution not yet supported", "INFO")
+    
     def execute_arbitrage(self, event_name: str, market_type: str, 
                          side1_name: str, side1_price: float, side1_market_name: str,
                          side2_name: str, side2_price: float, side2_market_name: str,
@@ -890,34 +1421,90 @@ class OrderbookMonitor:
                 side2_price=side2_price,
                 total=total,
                 profit_percent=profit_percent,
-                timestamp=time.time()
+                timestamp=time.time_ns()
             )
             
+            pair_key = f"{event_name}_{market_type}"
+            if pair_key in self.arbitrage_in_flight:
+                return
+            
             # Execute
             self.log(f"🚀 Executing arbitrage: {event_name} ({market_type}) - {profit_percent:.2f}% profit", "WARNING")
-            execution = self.arbitrage_executor.execute_arbitrage(opportunity)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
             
-            if execution.success:
-                self.log(f"✅ Arbitrage executed successfully! Orders: {execution.order1_id}, {execution.order2_id}", "WARNING")
+            if loop:
+                # Place orders off the WebSocket loop so book updates keep flowing
+                self.arbitrage_in_flight[pair_key] = loop.create_task(
+                    self.execute_arbitrage_async(pair_key, opportunity)
+                )
             else:
-                self.log(f"❌ Arbitrage execution failed: {execution.error}", "ERROR")
+                self.report_execution(self.arbitrage_executor.execute_arbitrage(opportunity))
                 
         except Exception as e:
             self.log(f"❌ Error executing arbitrage: {str(e)}", "ERROR")
     
-    def start(self):
-        """Start monitoring"""
+    async def execute_arbitrage_async(self, pair_key: str, opportunity: ArbitrageOpportunity):
+        """Execute arbitrage in the background and report the result"""
+        try:
+            execution = await self.arbitrage_executor.execute_arbitrage_async(opportunity)
+            self.report_execution(execution)
+        except Exception as e:
+            self.log(f"❌ Error executing arbitrage: {str(e)}", "ERROR")
+        finally:
+            self.arbitrage_in_flight.pop(pair_key, None)
+    
+    def report_execution(self, execution):
+        """Log the outcome of an arbitrage execution"""
+        if execution.success:
+            self.log(f"✅ Arbitrage executed successfully! Orders: {execution.order1_id}, {execution.order2_id}", "WARNING")
+        else:
+            self.log(f"❌ Arbitrage execution failed: {execution.error}", "ERROR")
+    
+    async def run(self):
+        """Run the monitor on the current event loop until stop() is called"""
+        self.stopped.clear()
         self.running = True
         self.log("🚀 Orderbook monitor started!")
         
-        # Use WebSocket for real-time updates
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.connect_websocket())
+        try:
+            # Use WebSocket for real-time updates; REST polling shares the same loop
+            self._loop = asyncio.get_running_loop()
+            self._stop = asyncio.Event()
+            self._resubscribe = asyncio.Event()
+            tasks = [self.connect_websocket()]
+            if config.ENABLE_REST_POLLING:
+                tasks.append(self.poll_orderbooks())
+            await asyncio.gather(*tasks)
+        finally:
+            self.stopped.set()
+    
+    def start(self):
+        """Start monitoring on a new event loop (blocks until stop())"""
+        if uvloop:
+            uvloop.run(self.run())
+        else:
+            asyncio.run(self.run())
+    
+    def resubscribe(self):
+        """Reconnect the WebSocket with the current subscriptions
+        
+        Safe to call from any thread; does nothing if the monitor is not running.
+        """
+        loop = self._loop
+        if self.running and loop and loop.is_running():
+            loop.call_soon_threadsafe(self._resubscribe.set)
     
     def stop(self):
         """Stop monitoring"""
         self.running = False
+        
+        # Wake the receive loop (stop() is called from another thread)
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._stop.set)
         self.log("🛑 Orderbook monitor stopped")
     
     def get_status(self) -> Dict:
@@ -926,32 +1513,139 @@ class OrderbookMonitor:
             'running': self.running,
             'subscribed_markets': len(self.subscribed_markets),
             'ath_records': len(self.ath_records),
-            'total_updates': sum(len(data) for data in self.orderbook_data.values())
+            'total_updates': self.total_updates
         }
     
+    def cached_dicts(self, items: List[tuple], cache: Dict[str, tuple]) -> tuple:
+        """Plain-dict views of keyed records, converting only records replaced since the last call
+        
+        Records are never mutated in place (a new object is stored on every
+        update), so an identity check tells whether the cached dict is current.
+        
+        Returns:
+            (list of dicts, refreshed cache)
+        """
+        dicts = []
+        fresh = {}
+        for key, record in items:
+            hit = cache.get(key)
+            if hit is None or hit[0] is not record:
+                hit = (record, record.to_dict())
+            fresh[key] = hit
+            dicts.append(hit[1])
+        return dicts, fresh
+    
     def get_current_orderbooks(self) -> List[Dict]:
         """Get current orderbook snapshots"""
-        return [asdict(snapshot) for snapshot in self.current_snapshots.values()]
+        dicts, self._snapshot_dicts = self.cached_dicts(list(self.current_snapshots.items()), self._snapshot_dicts)
+        return dicts
+    
+    def get_orderbooks_payload(self) -> str:
+        """Serialized ``{'type': 'orderbooks', 'data': [...]}`` message for WebSocket clients
+        
+        Encoded at most once per update_seq and shared by every connected client.
+        """
+        with self._payload_lock:
+            seq = self.update_seq
+            if self._orderbooks_payload is None or self._orderbooks_payload[0] != seq:
+                payload = orjson.dumps({'type': 'orderbooks', 'data': self.get_current_orderbooks()}).decode()
+                self._orderbooks_payload = (seq, payload)
+            return self._orderbooks_payload[1]
     
     def get_ath_records(self) -> List[Dict]:
         """Get all ATH records"""
-        return [asdict(record) for record in self.ath_records.values()]
+        dicts, self._ath_dicts = self.cached_dicts(list(self.ath_records.items()), self._ath_dicts)
+        return dicts
+    
+    def get_ath_snapshot(self) -> tuple:
+        """All ATH records together with the ath_seq they are current as of
+        
+        Returns:
+            (ath_seq, list of record dicts) - pass the seq to get_ath_since()
+            for the records that follow
+        """
+        with self.ath_cond:
+            return self.ath_seq, self.get_ath_records()
+    
+    def get_ath_since(self, since: int) -> tuple:
+        """New ATH records after ATH sequence number ``since``
+        
+        Args:
+            since: Last ath_seq the caller has seen
+            
+        Returns:
+            (current ath_seq, list of record dicts). If ``since`` is older than
+            the retained log or newer than ath_seq, the list holds every current
+            ATH record instead.
+        """
+        with self.ath_cond:
+            seq = self.ath_seq
+            log = self.ath_log
+            # Older than the retained log, or ahead of us (a seq from before a restart)
+            if since > seq or (log and since < log[0][0] - 1):
+                return seq, self.get_ath_records()
+            new = []
+            for entry_seq, record in reversed(log):
+                if entry_seq <= since:
+                    break
+                new.append(record)
+        new.reverse()
+        return seq, new
     
     def get_atl_records(self) -> List[Dict]:
         """Get all ATL records"""
-        return [asdict(record) for record in self.atl_records.values()]
+        dicts, self._atl_dicts = self.cached_dicts(list(self.atl_records.items()), self._atl_dicts)
+        return dicts
+    
+    def get_moneyline_asks(self) -> List[Dict]:
+        """Current ask and ask-side ATL for every moneyline market (not spread or totals)
+        
+        Moneyline flags and team names are fixed when the asset's handler is
+        built, and the ATL is a direct key lookup, so a request only walks the
+        selected rows.
+        """
+        n = len(self.asset_ids)
+        rows = np.flatnonzero(self.is_moneyline[:n] & ~np.isnan(self.cur_ask[:n]))
+        asks = []
+        for i in rows.tolist():
+            token_id = self.asset_ids[i]
+            snapshot = self.current_snapshots.get(token_id)
+            if snapshot is None:
+                continue
+            atl = self.atl_records.get(f"{token_id}_ask")
+            asks.append({
+                'team': self.asset_teams[i],
+                'current_ask': float(self.cur_ask[i]),
+                'ask_size': float(self.cur_ask_size[i]),
+                'atl_ask': atl.price if atl else None,
+                'atl_size': atl.size if atl else None,
+                'atl_timestamp': atl.timestamp if atl else None,
+                'market_name': snapshot.market_name
+            })
+        return asks
+    
+    @staticmethod
+    def deque_tail(items: deque, count: int) -> list:
+        """Last ``count`` items of a deque, oldest first
+        
+        Walks back from the right end, so the cost is O(count) however long
+        the deque is (islice from the left would skip over the head first).
+        """
+        tail = list(islice(reversed(items), max(count, 0)))
+        tail.reverse()
+        return tail
     
     def get_logs(self, count: int = 100) -> List[Dict]:
         """Get recent logs"""
-        return list(self.logs)[-count:]
+        return self.deque_tail(self.logs, count)
     
     def get_best_matches(self) -> List[Dict]:
         """Get all best matches (pairs under $1)"""
-        return [asdict(match) for match in self.best_matches]
+        return list(self.best_match_dicts)
     
     def get_total_records(self, limit: int = 100) -> List[Dict]:
         """Get historical total records"""
-        return [asdict(record) for record in self.total_records[-limit:]]
+        return self.deque_tail(self.total_record_dicts, limit)
 
 # Global monitor instance
 monitor = OrderbookMonitor()
@@ -117,6 +117,13 @@ def test_multiple_3way_scenarios():
             print(f"  ✅ 3-way arbitrage opportunity!")
         else:
             print(f"  ❌ No arbitrage (total >= $1)")
+    
+    # Batch path (compiled 3-way kernel) must agree with the scalar one
+    prices = [(p1, p2, p3) for _, p1, p2, p3, _ in scenarios]
+    batch = executor.calculate_stakes_batch(prices, 11.0)
+    for (p1, p2, p3), row in zip(prices, batch):
+        scalar = executor.calculate_stakes_3way(p1, p2, p3, 11.0)
+        assert all(abs(b - s) < 1e-9 for b, s in zip(row, scalar))
 
 if __name__ == "__main__":
     test_3way_calculation()
@@ -3,7 +3,50 @@
 Test arbitrage calculation logic
 """
 
-from arbitrage_executor import ArbitrageExecutor
+import os
+import time
+import tempfile
+import config
+from arbitrage_executor import ArbitrageExecutor, ArbitrageOpportunity, ArbitrageExecution, ExecutionLog
+
+class FakeApiError(Exception):
+    """Stand-in for PolyApiException carrying an HTTP status"""
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+class FakeClient:
+    """CLOB client that signs trivially and posts from a scripted list of outcomes"""
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = 0
+        self.cancelled = []
+    
+    def create_order(self, order_args):
+        return order_args
+    
+    def post_order(self, signed_order, order_type):
+        self.posts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {'orderID': outcome}
+    
+    def cancel(self, order_id):
+        self.cancelled.append(order_id)
+
+def make_posting_executor(*clients) -> ArbitrageExecutor:
+    """Executor wired to fake clients with order posting switched on"""
+    executor = ArbitrageExecutor(
+        private_key="0x" + "0" * 64,
+        bankroll=100.0,
+        min_profit_percent=1.0,
+        auto_execute=False
+    )
+    executor.post_orders = True
+    executor.clients = list(clients)
+    executor.client = clients[0]
+    return executor
 
 def test_stake_calculation():
     """Test stake calculation for equal profit"""
@@ -92,6 +135,7 @@ def test_multiple_scenarios():
         stake1, stake2 = executor.calculate_stakes(price1, price2, 100.0)
         profit = executor.calculate_profit(price1, price2, stake1, stake2)
         profit_percent = (profit / 100.0) * 100
+        assert abs(executor.calculate_profit_from_total(price1 + price2, 100.0) - profit) < 1e-9
         
         print(f"\n{name}:")
         print(f"  Prices: ${price1:.2f} + ${price2:.2f} = ${total:.2f}")
@@ -103,6 +147,152 @@ def test_multiple_scenarios():
         else:
             print(f"  ❌ No arbitrage (total >= $1)")
 
+def test_batch_scoring():
+    """Test batch stake/profit calculation matches the scalar path"""
+    print("\nTesting Batch Scoring:")
+    print("=" * 60)
+    
+    scenarios = [
+        (0.49, 0.48),
+        (0.41, 0.54),
+        (0.60, 0.34),
+        (0.51, 0.50),
+    ]
+    
+    executor = ArbitrageExecutor(
+        private_key="0x" + "0" * 64,
+        bankroll=100.0,
+        min_profit_percent=1.0,
+        auto_execute=False
+    )
+    
+    stakes = executor.calculate_stakes_batch(scenarios, 100.0)
+    profits = executor.calculate_profit_batch(scenarios, stakes)
+    
+    for (price1, price2), (batch1, batch2), batch_profit in zip(scenarios, stakes, profits):
+        stake1, stake2 = executor.calculate_stakes(price1, price2, 100.0)
+        profit = executor.calculate_profit(price1, price2, stake1, stake2)
+        
+        print(f"  ${price1:.2f} + ${price2:.2f}: stakes ${batch1:.2f} + ${batch2:.2f}, profit ${batch_profit:.2f}")
+        assert abs(batch1 - stake1) < 1e-9 and abs(batch2 - stake2) < 1e-9
+        assert abs(batch_profit - profit) < 1e-9
+    
+    print("  ✅ Batch results match scalar results")
+
+def test_order_retry_and_breaker():
+    """Retry once on 429/5xx, trip the breaker on repeated failures, fail fast while open"""
+    print("\n" + "=" * 60)
+    print("Testing Order Retry and Circuit Breaker")
+    print("=" * 60)
+    
+    # One retryable error, then success
+    for status in (429, 503):
+        client = FakeClient([FakeApiError(status), 'order-1'])
+        executor = make_posting_executor(client)
+        assert executor._post_signed_order(object()) == 'order-1'
+        assert client.posts == 2 and not executor._recent_failures
+    print("  ✅ 429 and 503 retried once")
+    
+    # Non-retryable errors fail on the first attempt and count toward the breaker
+    failures = [FakeApiError(400) for _ in range(config.ORDER_BREAKER_MAX_FAILURES)]
+    client = FakeClient(failures + ['order-2'])
+    executor = make_posting_executor(client)
+    for _ in range(config.ORDER_BREAKER_MAX_FAILURES):
+        assert executor._post_signed_order(object()) is None
+    assert client.posts == config.ORDER_BREAKER_MAX_FAILURES
+    assert executor._cooldown_until > time.monotonic()
+    print("  ✅ Breaker trips after repeated failures")
+    
+    # While open, orders are skipped without touching the client
+    assert executor._post_signed_order(object()) is None
+    assert client.posts == config.ORDER_BREAKER_MAX_FAILURES
+    
+    # Once the cooldown has passed, orders go out again
+    executor._cooldown_until = 0.0
+    assert executor._post_signed_order(object()) == 'order-2'
+    print("  ✅ Fails fast while open, recovers after cooldown")
+
+def make_opportunity() -> ArbitrageOpportunity:
+    """A 2-way moneyline opportunity at a $0.97 total"""
+    return ArbitrageOpportunity(
+        event_title='Lakers vs. Celtics', market_type='Moneyline',
+        side1_token_id='l', side1_name='Lakers', side1_price=0.48,
+        side2_token_id='c', side2_name='Celtics', side2_price=0.49,
+        total=0.97, profit_percent=3.09, timestamp=time.time_ns()
+    )
+
+def test_one_leg_raises():
+    """A leg that raises still gets the other leg cancelled"""
+    print("\n" + "=" * 60)
+    print("Testing One-Legged Fill Cleanup")
+    print("=" * 60)
+    
+    client1 = FakeClient(['order-1'])
+    client2 = FakeClient([RuntimeError("connection reset")])
+    executor = make_posting_executor(client1, client2)
+    executor._record_order_failure = lambda: 1 / 0  # A failure inside the leg thread itself
+    
+    execution = executor.execute_arbitrage(make_opportunity())
+    
+    assert not execution.success
+    assert execution.order1_id == 'order-1' and execution.order2_id is None
+    assert client1.cancelled == ['order-1']
+    print("  ✅ Filled leg cancelled after the other leg raised")
+
+def test_execution_log():
+    """Ring wrap-around, header restored on reopen, fresh ring on a size mismatch"""
+    print("\n" + "=" * 60)
+    print("Testing Execution Log")
+    print("=" * 60)
+    
+    def execution(n: int, success: bool, order_id: str = None) -> ArbitrageExecution:
+        return ArbitrageExecution(
+            opportunity=make_opportunity(), bankroll=100.0, stake1=49.0, stake2=51.0,
+            order1_id=order_id or f"0x{n:064x}", order2_id=None if not success else f"0x{n + 100:064x}",
+            success=success, error=None, timestamp=n
+        )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'executions.bin')
+        
+        # Five executions through a three-slot ring: slots hold 4, 5, 3
+        log = ExecutionLog(path, 3)
+        for n in range(1, 6):
+            log.append(execution(n, success=n % 2 == 1), 2.0 if n % 2 == 1 else 0.0)
+        records = log.records()
+        assert list(records['timestamp']) == [4, 5, 3]
+        assert records['order1_id'][0] == f"0x{4:064x}".encode()
+        assert list(records['success']) == [False, True, True]
+        print("  ✅ Oldest records overwritten in ring order")
+        
+        # A held copy does not keep the map from closing
+        log.close()
+        assert len(records) == 3
+        
+        # Reopen with the same capacity: lifetime totals and records survive
+        log = ExecutionLog(path, 3)
+        assert log.summary() == {
+            'total_executions': 5, 'successful_trades': 3, 'failed_trades': 2, 'total_profit': 6.0
+        }
+        assert list(log.records()['timestamp']) == [4, 5, 3]
+        
+        # Order IDs too long for the field are blanked rather than truncated
+        log.append(execution(6, success=False, order_id='0x' + 'f' * 80), 0.0)
+        assert log.records()['order1_id'][2] == b''
+        log.close()
+        print("  ✅ Header restored on reopen")
+        
+        # Different capacity means a different file size: start a fresh ring
+        log = ExecutionLog(path, 4)
+        assert log.summary()['total_executions'] == 0 and len(log.records()) == 0
+        assert os.path.getsize(path) == ExecutionLog.HEADER.size + 4 * ExecutionLog.RECORD.size
+        log.close()
+        print("  ✅ Size mismatch resets the log")
+
 if __name__ == "__main__":
     test_stake_calculation()
     test_multiple_scenarios()
+    test_batch_scoring()
+    test_order_retry_and_breaker()
+    test_one_leg_raises()
+    test_execution_log()
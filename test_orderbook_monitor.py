@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test orderbook monitor bookkeeping (pair checks, ATH deltas, latency window, book parsing, loop marshalling)
+"""
+
+import asyncio
+import json
+import random
+import threading
+from orderbook_monitor import OrderbookMonitor, SportMatch, LatencyWindow
+
+def make_match() -> SportMatch:
+    """A match with a 2-way moneyline, a totals pair and a 3-way market"""
+    markets = [
+        ('Lakers vs. Celtics', ['Lakers', 'Celtics'], ['l', 'c']),
+        ('Lakers vs. Celtics: O/U 220.5', ['Over', 'Under'], ['o', 'u']),
+        ('Arsenal vs. Chelsea', ['Arsenal', 'Draw', 'Chelsea'], ['a', 'd', 'h']),
+    ]
+    return SportMatch(
+        event_id='e1',
+        title='Test match',
+        slug='test-match',
+        start_time='',
+        end_time='',
+        markets=[{
+            'question': question,
+            'outcomes': json.dumps(outcomes),
+            'clobTokenIds': json.dumps(tokens)
+        } for question, outcomes, tokens in markets]
+    )
+
+def make_book(token_id: str, ask: float) -> dict:
+    """Book message with asks sorted high to low, as the WebSocket sends them"""
+    return {
+        'asset_id': token_id,
+        'bids': [{'price': f"{ask - 0.02:.2f}", 'size': '5'}],
+        'asks': [{'price': '0.99', 'size': '10'}, {'price': f"{ask:.2f}", 'size': '10'}]
+    }
+
+def test_incremental_pairs_match_full_scan():
+    """Per-book check_pair must end on the same totals as one check_best_matches pass"""
+    print("=" * 60)
+    print("Testing Incremental Pair Checks vs Full Scan")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    tokens = ['l', 'c', 'o', 'u', 'a', 'd', 'h']
+    books = [make_book(token_id, rng.randint(20, 60) / 100) for token_id in tokens]
+    books += [make_book(rng.choice(tokens), rng.randint(20, 60) / 100) for _ in range(200)]
+
+    # Incremental: every book goes through process_book_message (check_pair per tick)
+    incremental = OrderbookMonitor()
+    incremental.subscribe_to_match(make_match())
+
+    async def feed():
+        for book in books:
+            await incremental.process_book_message(book)
+    asyncio.run(feed())
+
+    # Batch: only the book handlers run, then one full scan
+    batch = OrderbookMonitor()
+    batch.subscribe_to_match(make_match())
+    for book in books:
+        ask = float(book['asks'][-1]['price'])
+        bid = float(book['bids'][0]['price'])
+        batch.book_handlers[book['asset_id']](0.0, bid, 5.0, ask, 10.0)
+    batch.check_best_matches()
+
+    # Expected final totals straight from the last ask of each token
+    last_ask = {}
+    for book in books:
+        last_ask[book['asset_id']] = float(book['asks'][-1]['price'])
+    expected = {
+        'Lakers vs. Celtics_Moneyline': last_ask['l'] + last_ask['c'],
+        'Lakers vs. Celtics: O/U 220.5_O/U': last_ask['o'] + last_ask['u'],
+        'Arsenal vs. Chelsea_Moneyline': last_ask['a'] + last_ask['d'] + last_ask['h'],
+    }
+
+    assert set(incremental.last_totals) == set(batch.last_totals) == set(expected)
+    for key, total in expected.items():
+        print(f"  {key}: incremental ${incremental.last_totals[key]:.2f}, scan ${batch.last_totals[key]:.2f}")
+        assert abs(batch.last_totals[key] - total) < 1e-9
+        # The incremental path only records moves above $0.001
+        assert abs(incremental.last_totals[key] - total) <= 0.001 + 1e-9
+
+        # Both report the final state as a best match when it is under $1
+        if total < 1.0:
+            for monitor in (incremental, batch):
+                latest = [m for m in monitor.get_best_matches() if m['event_id'] == key][-1]
+                assert abs(latest['total'] - total) <= 0.001 + 1e-9
+
+    print("  ✅ Incremental and full-scan totals agree")
+
+def test_ath_since():
+    """get_ath_since returns deltas in range and the full set for stale or future seqs"""
+    print("\n" + "=" * 60)
+    print("Testing ATH Deltas")
+    print("=" * 60)
+
+    monitor = OrderbookMonitor()
+    monitor.check_ath('t1', 'A', 0.30, 1.0, 'ask')
+    monitor.check_ath('t1', 'A', 0.40, 1.0, 'ask')
+    monitor.check_ath('t2', 'B', 0.20, 1.0, 'bid')
+    assert monitor.ath_seq == 3
+
+    # In range: only records after the given seq
+    seq, records = monitor.get_ath_since(1)
+    assert seq == 3
+    assert [(r['market_id'], r['price']) for r in records] == [('t1', 0.40), ('t2', 0.20)]
+    assert monitor.get_ath_since(3) == (3, [])
+
+    # Too old for the retained log: every current record
+    monitor.ath_log.popleft()
+    monitor.ath_log.popleft()
+    seq, records = monitor.get_ath_since(0)
+    assert seq == 3 and len(records) == len(monitor.ath_records) == 2
+
+    # Ahead of ath_seq (e.g. a seq from before a restart): every current record
+    seq, records = monitor.get_ath_since(99)
+    assert seq == 3 and len(records) == 2
+
+    print("  ✅ In-range, too-old and future seqs handled")
+
+def test_latency_window():
+    """Running sum stays equal to the window contents as samples are evicted"""
+    print("\n" + "=" * 60)
+    print("Testing Latency Window")
+    print("=" * 60)
+
+    window = LatencyWindow(4)
+    assert len(window) == 0 and window.mean == 0.0
+
+    samples = [5_000_000, 1_000_000, 9_000_000, 3_000_000, 7_000_000, 2_000_000]
+    for n, sample in enumerate(samples, 1):
+        window.append(sample)
+        kept = samples[max(0, n - 4):n]
+        assert len(window) == len(kept) and window.count == n
+        assert sorted(window) == sorted(kept)
+        assert window.mean == sum(kept) / len(kept)
+
+    mean_ms, min_ms, max_ms = window.stats_ms()
+    assert (mean_ms, min_ms, max_ms) == (5.25, 2.0, 9.0)
+    print(f"  mean {mean_ms:.2f}ms, min {min_ms:.2f}ms, max {max_ms:.2f}ms")
+    print("  ✅ Evicted samples leave the running sum")
+
+def test_best_ask_level():
+    """Sorted books use the last level; an unsorted book switches its token to a full scan"""
+    print("\n" + "=" * 60)
+    print("Testing Best Ask Level")
+    print("=" * 60)
+
+    monitor = OrderbookMonitor()
+    descending = [{'price': '0.60', 'size': '1'}, {'price': '0.55', 'size': '2'}, {'price': '0.50', 'size': '3'}]
+    assert monitor.best_ask_level('sorted', descending) == (0.50, 3.0)
+    assert monitor.asks_descending['sorted'] is True
+
+    unsorted = [{'price': '0.55', 'size': '2'}, {'price': '0.48', 'size': '4'}, {'price': '0.60', 'size': '1'}]
+    assert monitor.best_ask_level('unsorted', unsorted) == (0.48, 4.0)
+    assert monitor.asks_descending['unsorted'] is False
+
+    # The verdict sticks per token: later books are scanned in full even if they look sorted
+    assert monitor.best_ask_level('unsorted', [{'price': '0.70', 'size': '1'}, {'price': '0.65', 'size': '5'}]) == (0.65, 5.0)
+    assert monitor.best_ask_level('unsorted', [{'price': '0.40', 'size': '1'}, {'price': '0.65', 'size': '5'}]) == (0.40, 1.0)
+    print("  ✅ Last level for sorted books, full scan after an unsorted one")
+
+def test_moneyline_asks():
+    """Moneyline sides (2- and 3-way) with their current ask and ask ATL; totals are left out"""
+    print("\n" + "=" * 60)
+    print("Testing Moneyline Asks")
+    print("=" * 60)
+
+    monitor = OrderbookMonitor()
+    monitor.subscribe_to_match(make_match())
+
+    async def feed():
+        for token_id, ask in [('l', 0.45), ('o', 0.50), ('a', 0.30), ('l', 0.50)]:
+            await monitor.process_book_message(make_book(token_id, ask))
+    asyncio.run(feed())
+
+    asks = {row['team']: row for row in monitor.get_moneyline_asks()}
+    assert set(asks) == {'Lakers', 'Arsenal'}  # Over has a book but is a total; the rest have none
+    lakers = asks['Lakers']
+    assert lakers['current_ask'] == 0.50 and lakers['ask_size'] == 10.0
+    assert lakers['atl_ask'] == 0.45
+    assert lakers['market_name'] == 'Lakers vs. Celtics - Lakers'
+    assert asks['Arsenal']['current_ask'] == asks['Arsenal']['atl_ask'] == 0.30
+    print("  ✅ Moneyline rows only, with current ask and ATL")
+
+def test_call_on_loop():
+    """Calls from other threads run on the loop thread; without a running loop they run inline"""
+    print("\n" + "=" * 60)
+    print("Testing call_on_loop")
+    print("=" * 60)
+
+    monitor = OrderbookMonitor()
+    assert monitor.call_on_loop(threading.current_thread) is threading.current_thread()
+
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever)
+    loop_thread.start()
+    try:
+        while not loop.is_running():
+            loop_thread.join(0.01)
+        monitor._loop = loop
+
+        # From a foreign thread: marshalled onto the loop, result and exceptions passed back
+        assert monitor.call_on_loop(threading.current_thread) is loop_thread
+        assert monitor.call_on_loop(lambda a, b: a + b, 2, 3) == 5
+        try:
+            monitor.call_on_loop(lambda: 1 / 0)
+            assert False, "exception not raised"
+        except ZeroDivisionError:
+            pass
+
+        # A subscription made from here lands on the loop thread too
+        added_on = []
+        add_match = monitor.add_match
+        monitor.add_match = lambda match: (added_on.append(threading.current_thread()), add_match(match))
+        monitor.subscribe_to_match(make_match())
+        assert added_on == [loop_thread] and 'e1' in monitor.subscribed_markets
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
+    # Loop gone: back to running inline
+    assert monitor.call_on_loop(threading.current_thread) is threading.current_thread()
+    print("  ✅ Marshalled onto the loop thread while it runs, inline otherwise")
+
+if __name__ == "__main__":
+    test_incremental_pairs_match_full_scan()
+    test_ath_since()
+    test_latency_window()
+    test_best_ask_level()
+    test_moneyline_asks()
+    test_call_on_loop()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test web app streaming endpoints
+"""
+
+import sys
+import threading
+from datetime import datetime, timezone, timedelta
+import orjson
+import orderbook_monitor
+import web_app
+
+def test_log_stream_no_duplicates():
+    """Entries logged while a client connects arrive exactly once, in order"""
+    print("=" * 60)
+    print("Testing Log Stream Delivery")
+    print("=" * 60)
+
+    monitor = web_app.monitor
+    client = web_app.app.test_client()
+
+    # Log nonstop while clients connect, with frequent thread switches, so
+    # entries keep landing between the backlog snapshot and the subscription
+    stop = threading.Event()
+    def produce():
+        n = 0
+        while not stop.is_set():
+            monitor.log(f"entry {n}")
+            n += 1
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    producer = threading.Thread(target=produce)
+    producer.start()
+
+    try:
+        for _ in range(300):
+            resp = client.get('/api/logs/stream', buffered=False)
+            received = []
+            try:
+                for chunk in resp.response:
+                    if chunk.startswith(b"data: "):
+                        message = orjson.loads(chunk[len(b"data: "):])['message']
+                        received.append(int(message.split()[1]))
+                    if len(received) == 150:  # Backlog of 100 plus live entries
+                        break
+            finally:
+                resp.close()
+
+            # Backlog then live entries: one contiguous run, nothing repeated or skipped
+            assert received == list(range(received[0], received[0] + len(received))), \
+                "duplicate or missing log entries"
+    finally:
+        stop.set()
+        producer.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert monitor._log_subscribers == []
+    print("  ✅ 20 clients, no duplicates, subscribers removed on close")
+
+class FakeWebSocket:
+    """Collects what a WebSocket route sends; disconnects after ``limit`` messages"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.messages = []
+
+    @property
+    def connected(self) -> bool:
+        return len(self.messages) < self.limit
+
+    def send(self, data: str):
+        self.messages.append(orjson.loads(data))
+
+def test_ath_socket_no_duplicates():
+    """A record made while the full set is being read is sent exactly once"""
+    print("\n" + "=" * 60)
+    print("Testing ATH WebSocket Delivery")
+    print("=" * 60)
+
+    monitor = web_app.monitor
+    route = web_app.app.view_functions['ws_ath'].__wrapped__  # The handler behind the WebSocket upgrade
+    monitor.check_ath('m1', 'Market', 0.40, 1.0, 'ask')
+
+    # Record a new ATH from another thread in the middle of reading the full set
+    get_ath_records = monitor.get_ath_records
+    def get_ath_records_racing():
+        monitor.get_ath_records = get_ath_records
+        writer = threading.Thread(target=monitor.check_ath, args=('m2', 'Market', 0.55, 1.0, 'ask'))
+        writer.start()
+        writer.join(0.1)  # Completes now unless the snapshot holds it off
+        return get_ath_records()
+    monitor.get_ath_records = get_ath_records_racing
+
+    ws = FakeWebSocket(limit=2)
+    route(ws)  # Full set, then one delta
+
+    seqs = [m['seq'] for m in ws.messages]
+    assert seqs == sorted(set(seqs))
+    sent = [(r['market_id'], r['price']) for m in ws.messages for r in m['data']]
+    assert len(sent) == len(set(sent)), "ATH record sent twice"
+    assert ('m2', 0.55) in sent
+    print("  ✅ Record made during the snapshot sent once")
+
+class FakeEventsResponse:
+    """Gamma /events response with one upcoming match"""
+    status_code = 200
+
+    def json(self):
+        start = (datetime.now(timezone.utc) + timedelta(hours=2)).isoformat()
+        return [{'id': 'e1', 'slug': 'nba-lal-bos', 'title': 'Lakers vs. Celtics', 'creationDate': start, 'markets': []}]
+
+def test_matches_active_flag():
+    """Cached /api/matches bodies follow subscriptions, including across a refresh"""
+    print("\n" + "=" * 60)
+    print("Testing Matches Cache")
+    print("=" * 60)
+
+    monitor = web_app.monitor
+    client = web_app.app.test_client()
+    get = orderbook_monitor.requests.get
+    orderbook_monitor.requests.get = lambda *args, **kwargs: FakeEventsResponse()
+
+    def active() -> bool:
+        return client.get('/api/matches?hours=48').json[0]['active']
+
+    try:
+        assert active() is False
+        assert client.post('/api/subscribe', json={'event_id': 'e1'}).json['success']
+        assert active() is True  # subscription_seq moved, so the cached body was rebuilt
+        print("  ✅ Subscribe invalidates the cached body")
+
+        # A refresh brings new SportMatch objects that were never flagged active
+        monitor.get_upcoming_sports_matches(hours_ahead=48, refresh=True)
+        assert active() is True
+        print("  ✅ Subscribed match stays active after a refresh")
+
+        client.post('/api/unsubscribe', json={'event_id': 'e1'})
+        assert active() is False
+        print("  ✅ Unsubscribe invalidates the cached body")
+    finally:
+        orderbook_monitor.requests.get = get
+        monitor.remove_match('e1')
+
+if __name__ == "__main__":
+    test_log_stream_no_duplicates()
+    test_ath_socket_no_duplicates()
+    test_matches_active_flag()
@@ -7,13 +7,31 @@ Real-time dashboard with WebSocket support
 from flask import Flask, render_template, jsonify, request, Response
 from flask_cors import CORS
 from flask_sock import Sock
-import json
+from flask.json.provider import JSONProvider
+import orjson
 import threading
 import time
+import queue
 from orderbook_monitor import OrderbookMonitor
 from arbitrage_executor import ArbitrageExecutor
 import config
 
+class OrjsonProvider(JSONProvider):
+    """Route jsonify / app.json through orjson"""
+    
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.OPTIONS), mimetype='application/json')
+
 # Initialize arbitrage executor if enabled
 arbitrage_executor = None
 if config.ARBITRAGE_ENABLED and config.ARBITRAGE_PRIVATE_KEY:
@@ -22,7 +40,8 @@ if config.ARBITRAGE_ENABLED and config.ARBITRAGE_PRIVATE_KEY:
             private_key=config.ARBITRAGE_PRIVATE_KEY,
             bankroll=config.ARBITRAGE_BANKROLL,
             min_profit_percent=config.ARBITRAGE_MIN_PROFIT_PERCENT,
-            auto_execute=True
+            auto_execute=True,
+            execution_log_path=config.ARBITRAGE_EXECUTION_LOG
         )
         print("✅ Arbitrage executor initialized")
     except Exception as e:
@@ -32,12 +51,17 @@ if config.ARBITRAGE_ENABLED and config.ARBITRAGE_PRIVATE_KEY:
 monitor = OrderbookMonitor(arbitrage_executor=arbitrage_executor)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 sock = Sock(app)
 
 # Monitor thread
 monitor_thread = None
 
+# hours_ahead -> (matches list, subscription_seq, encoded /api/matches body); at most MATCHES_CACHE_MAX_KEYS
+matches_payloads = {}
+matches_payloads_lock = threading.Lock()
+
 @app.route('/')
 def index():
     """Main dashboard"""
@@ -57,9 +81,7 @@ def api_status():
     
     # Add performance metrics
     if monitor.update_latencies:
-        avg_latency = sum(monitor.update_latencies) / len(monitor.update_latencies)
-        min_latency = min(monitor.update_latencies)
-        max_latency = max(monitor.update_latencies)
+        avg_latency, min_latency, max_latency = monitor.update_latencies.stats_ms()
         status['avg_latency_ms'] = round(avg_latency, 2)
         status['min_latency_ms'] = round(min_latency, 2)
         status['max_latency_ms'] = round(max_latency, 2)
@@ -74,14 +96,30 @@ def api_matches():
     """Get upcoming sports matches"""
     hours = request.args.get('hours', config.DEFAULT_HOURS_AHEAD, type=int)
     matches = monitor.get_upcoming_sports_matches(hours_ahead=hours)
-    return jsonify([{
-        'event_id': m.event_id,
-        'title': m.title,
-        'slug': m.slug,
-        'start_time': m.start_time,
-        'end_time': m.end_time,
-        'active': m.active
-    } for m in matches])
+    
+    # The monitor returns the same list while its cache is fresh, so encode each
+    # list once; a subscribe/unsubscribe forces a re-encode. 'active' comes from
+    # the monitor's subscriptions, not the match objects: a refreshed list holds
+    # new SportMatch objects that were never flagged.
+    seq = monitor.subscription_seq
+    with matches_payloads_lock:
+        cached = matches_payloads.get(hours)
+    if cached is None or cached[0] is not matches or cached[1] != seq:
+        subscribed = monitor.subscribed_markets
+        cached = (matches, seq, orjson.dumps([{
+            'event_id': m.event_id,
+            'title': m.title,
+            'slug': m.slug,
+            'start_time': m.start_time,
+            'end_time': m.end_time,
+            'active': m.event_id in subscribed
+        } for m in matches]))
+        with matches_payloads_lock:
+            matches_payloads.pop(hours, None)
+            while len(matches_payloads) >= config.MATCHES_CACHE_MAX_KEYS:
+                del matches_payloads[next(iter(matches_payloads))]  # Oldest entry first
+            matches_payloads[hours] = cached
+    return Response(cached[2], mimetype='application/json')
 
 @app.route('/api/subscribed')
 def api_subscribed():
@@ -108,9 +146,9 @@ def api_subscribe():
         if not success:
             return jsonify({'success': False, 'message': f'Failed to subscribe to {event_slug}'}), 404
         
-        # Restart monitor if running
+        # Reconnect the running monitor with the new subscription
         if monitor.running:
-            restart_monitor()
+            monitor.resubscribe()
         
         return jsonify({'success': True, 'message': f'Subscribed to {event_slug}'})
     
@@ -119,17 +157,16 @@ def api_subscribe():
         return jsonify({'success': False, 'message': 'Missing event_id or event_slug'}), 400
     
     # Find match
-    matches = monitor.get_upcoming_sports_matches(hours_ahead=48)
-    match = next((m for m in matches if m.event_id == event_id), None)
+    match = monitor.find_match(event_id, hours_ahead=48)
     
     if not match:
         return jsonify({'success': False, 'message': 'Match not found'}), 404
     
     monitor.subscribe_to_match(match)
     
-    # Restart monitor if running
+    # Reconnect the running monitor with the new subscription
     if monitor.running:
-        restart_monitor()
+        monitor.resubscribe()
     
     return jsonify({'success': True, 'message': f'Subscribed to {match.title}'})
 
@@ -157,6 +194,10 @@ def api_start():
     if not monitor.subscribed_markets:
         return jsonify({'success': False, 'message': 'No markets subscribed'})
     
+    # A just-stopped monitor may still be closing its socket; start once it has exited
+    if not monitor.stopped.wait(timeout=2):
+        return jsonify({'success': False, 'message': 'Monitor is still stopping, try again'})
+    
     monitor_thread = threading.Thread(target=monitor.start, daemon=config.DAEMON_THREADS)
     monitor_thread.start()
     
@@ -176,47 +217,16 @@ def api_orderbooks():
 @app.route('/api/asks')
 def api_asks():
     """Get only asks (sell orders) for both teams with ATL"""
-    orderbooks = monitor.get_current_orderbooks()
-    atl_records = monitor.get_atl_records()
-    
-    # Create ATL lookup by market name
-    atl_lookup = {}
-    for atl in atl_records:
-        if atl['side'] == 'ask':
-            atl_lookup[atl['market_name']] = {
-                'price': atl['price'],
-                'size': atl['size'],
-                'timestamp': atl['timestamp']
-            }
-    
-    # Filter for moneyline markets only (the main team vs team bets)
-    asks = []
-    for ob in orderbooks:
-        # Only show moneyline (not spread or totals)
-        if 'O/U' not in ob['market_name'] and 'Spread' not in ob['market_name']:
-            # Extract team name from "Question - Team" format
-            parts = ob['market_name'].split(' - ')
-            team_name = parts[-1] if len(parts) > 1 else ob['market_name']
-            
-            # Get ATL for this market
-            atl = atl_lookup.get(ob['market_name'], None)
-            
-            asks.append({
-                'team': team_name,
-                'current_ask': ob['best_ask'],
-                'ask_size': ob['ask_size'],
-                'atl_ask': atl['price'] if atl else None,
-                'atl_size': atl['size'] if atl else None,
-                'atl_timestamp': atl['timestamp'] if atl else None,
-                'market_name': ob['market_name']
-            })
-    
-    return jsonify(asks)
+    return jsonify(monitor.get_moneyline_asks())
 
 @app.route('/api/ath')
 def api_ath():
-    """Get ATH records"""
-    return jsonify(monitor.get_ath_records())
+    """Get ATH records, or only those newer than ?since=<seq>"""
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify(monitor.get_ath_records())
+    seq, records = monitor.get_ath_since(since)
+    return jsonify({'seq': seq, 'data': records})
 
 @app.route('/api/atl')
 def api_atl():
@@ -238,18 +248,17 @@ def api_logs():
 def api_logs_stream():
     """Stream logs via SSE"""
     def generate():
-        last_count = 0
-        while True:
-            logs = monitor.get_logs()
-            current_count = len(logs)
-            
-            if current_count > last_count:
-                new_logs = logs[last_count:]
-                for log in new_logs:
-                    yield f"data: {json.dumps(log)}\n\n"
-                last_count = current_count
-            
-            time.sleep(config.LOG_STREAM_INTERVAL)
+        backlog, q = monitor.subscribe_logs(100)
+        try:
+            for log in backlog:  # Backlog first, then live entries
+                yield b"data: " + orjson.dumps(log) + b"\n\n"
+            while True:
+                try:
+                    yield q.get(timeout=config.LOG_STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield b": keepalive\n\n"  # Lets a dead client surface as GeneratorExit
+        finally:
+            monitor.unsubscribe_logs(q)
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -279,7 +288,7 @@ def api_arbitrage_executions():
     """Get arbitrage execution history"""
     if arbitrage_executor:
         limit = request.args.get('limit', 50, type=int)
-        executions = arbitrage_executor.executions[-limit:]
+        executions = list(arbitrage_executor.executions)[-limit:]
         return jsonify([{
             'event_title': e.opportunity.event_title,
             'market_type': e.opportunity.market_type,
@@ -289,52 +298,49 @@ def api_arbitrage_executions():
             'stake2': e.stake2,
             'success': e.success,
             'error': e.error,
-            'timestamp': e.timestamp
+            'timestamp': e.timestamp / 1e9  # ns -> epoch seconds
         } for e in executions])
     return jsonify([])
 
 @sock.route('/ws/orderbooks')
 def ws_orderbooks(ws):
-    """WebSocket for real-time orderbook updates"""
+    """WebSocket for real-time orderbook updates (pushed when books change)
+    
+    Pushes are spaced at least WS_PUSH_MIN_INTERVAL apart, so a burst of ticks
+    costs one send per client instead of waking every client thread per tick
+    and competing with the monitor thread for the GIL.
+    """
+    seq = -1
     while True:
         try:
-            orderbooks = monitor.get_current_orderbooks()
-            ws.send(json.dumps({
-                'type': 'orderbooks',
-                'data': orderbooks
-            }))
-            time.sleep(1)
+            seq = monitor.wait_for_update(seq, timeout=5)
+            ws.send(monitor.get_orderbooks_payload())
+            time.sleep(config.WS_PUSH_MIN_INTERVAL)
         except Exception as e:
             break
 
 @sock.route('/ws/ath')
 def ws_ath(ws):
-    """WebSocket for ATH updates"""
-    last_count = 0
-    while True:
+    """WebSocket for ATH updates: all records first, then only new ones as they are recorded"""
+    seq, records = monitor.get_ath_snapshot()
+    try:
+        ws.send(orjson.dumps({'type': 'ath', 'seq': seq, 'data': records}).decode())
+    except Exception as e:
+        return
+    while ws.connected:
         try:
-            ath_records = monitor.get_ath_records()
-            if len(ath_records) > last_count:
-                ws.send(json.dumps({
-                    'type': 'ath',
-                    'data': ath_records
-                }))
-                last_count = len(ath_records)
-            time.sleep(0.5)
+            new_seq = monitor.wait_for_update(seq, timeout=5, ath=True)
+            if new_seq != seq:
+                seq, records = monitor.get_ath_since(seq)
+                if records:
+                    ws.send(orjson.dumps({
+                        'type': 'ath',
+                        'seq': seq,
+                        'data': records
+                    }).decode())
         except Exception as e:
             break
 
-def restart_monitor():
-    """Restart monitor with new subscriptions"""
-    global monitor_thread
-    
-    if monitor.running:
-        monitor.stop()
-        time.sleep(1)
-    
-    monitor_thread = threading.Thread(target=monitor.start, daemon=config.DAEMON_THREADS)
-    monitor_thread.start()
-
 if __name__ == '__main__':
     print("🚀 Starting Polymarket Orderbook Monitor Web Interface...")
     print(f"📊 Dashboard: http://localhost:{config.WEB_PORT}")